@@ -0,0 +1,473 @@
+"""In-process stand-ins for Red's Config and the discord objects the cogs use.
+
+They implement only what the cogs call, and count the work a real bot would
+do: Config reads, writes and bytes written, and Discord API calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import itertools
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import discord
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Generator
+
+_ids = itertools.count(10**17)
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+@dataclass
+class ConfigStats:
+    reads: int = 0
+    writes: int = 0
+    bytes_written: int = 0
+
+    def reset(self) -> None:
+        self.reads = self.writes = self.bytes_written = 0
+
+
+class FakeContext:
+    """What Red's `Value()` and `Group.all()` return.
+
+    Awaiting it reads the value. Using it with `async with` gives a copy to
+    change in place, which is written back in one write on exit.
+    """
+
+    def __init__(self, read: Callable[[], Awaitable[Any]], write: Callable) -> None:
+        self._read = read
+        self._write = write
+        self._value: Any = None
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        return self._read().__await__()
+
+    async def __aenter__(self) -> Any:
+        self._value = await self._read()
+        return self._value
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self._write(self._value)
+
+
+class FakeValue:
+    """A value or nested group inside a FakeConfig scope, e.g. `guild.dictionary`."""
+
+    def __init__(self, config: FakeConfig, scope: tuple, path: tuple[str, ...]) -> None:
+        self._config = config
+        self._scope = scope
+        self._path = path
+
+    def __getattr__(self, name: str) -> FakeValue:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return FakeValue(self._config, self._scope, (*self._path, name))
+
+    def __call__(self) -> FakeContext:
+        return self.all()
+
+    def all(self) -> FakeContext:
+        return FakeContext(
+            lambda: self._config._get(self._scope, self._path),
+            self.set,
+        )
+
+    async def set(self, value: Any) -> None:
+        await self._config._set(self._scope, self._path, value)
+
+    async def get_raw(self, *keys: str, default: Any = ...) -> Any:
+        return await self._config._get(self._scope, (*self._path, *keys), default)
+
+    async def set_raw(self, *keys: str, value: Any) -> None:
+        await self._config._set(self._scope, (*self._path, *keys), value)
+
+    async def clear_raw(self, *keys: str) -> None:
+        await self._config._clear(self._scope, (*self._path, *keys))
+
+    async def clear(self) -> None:
+        await self._config._clear(self._scope, self._path)
+
+
+class FakeMembersGroup:
+    """All member data of one guild, as returned by `Config._get_base_group`."""
+
+    def __init__(self, config: FakeConfig, guild_id: int) -> None:
+        self._config = config
+        self._guild_id = guild_id
+
+    def all(self) -> FakeContext:
+        return FakeContext(self._read, self._write)
+
+    async def _read(self) -> dict[str, Any]:
+        self._config.stats.reads += 1
+        return {
+            str(scope[2]): copy.deepcopy(data)
+            for scope, data in self._config.data.items()
+            if scope[0] == "MEMBER" and scope[1] == self._guild_id
+        }
+
+    async def _write(self, members: dict[str, Any]) -> None:
+        self._config.stats.writes += 1
+        self._config.stats.bytes_written += len(json.dumps(members))
+        for scope in [
+            scope
+            for scope in self._config.data
+            if scope[0] == "MEMBER" and scope[1] == self._guild_id
+        ]:
+            del self._config.data[scope]
+        for member_id, data in members.items():
+            scope = ("MEMBER", self._guild_id, int(member_id))
+            self._config.data[scope] = copy.deepcopy(data)
+
+
+class FakeConfig:
+    """Keeps registered defaults and stored data in dictionaries.
+
+    Reads return deep copies like Red's JSON driver. Every write counts the
+    JSON size of the value written, which is what a driver would serialize.
+    """
+
+    GUILD = "GUILD"
+    MEMBER = "MEMBER"
+
+    def __init__(self) -> None:
+        self.defaults: dict[str, dict[str, Any]] = {}
+        self.data: dict[tuple, dict[str, Any]] = {}
+        self.stats = ConfigStats()
+
+    @classmethod
+    def get_conf(cls, *_: object, **__: object) -> FakeConfig:
+        return cls()
+
+    def register_global(self, **defaults: Any) -> None:
+        self.defaults["GLOBAL"] = defaults
+
+    def register_guild(self, **defaults: Any) -> None:
+        self.defaults["GUILD"] = defaults
+
+    def register_member(self, **defaults: Any) -> None:
+        self.defaults["MEMBER"] = defaults
+
+    def __getattr__(self, name: str) -> FakeValue:
+        # registered global values, e.g. `config.last_checks`
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return FakeValue(self, ("GLOBAL",), (name,))
+
+    def guild(self, guild: discord.Guild) -> FakeValue:
+        return self.guild_from_id(guild.id)
+
+    def guild_from_id(self, guild_id: int) -> FakeValue:
+        return FakeValue(self, ("GUILD", guild_id), ())
+
+    def member(self, member: discord.Member) -> FakeValue:
+        return self.member_from_ids(member.guild.id, member.id)
+
+    def member_from_ids(self, guild_id: int, member_id: int) -> FakeValue:
+        return FakeValue(self, ("MEMBER", guild_id, member_id), ())
+
+    def _get_base_group(self, category: str, guild_id: str) -> FakeMembersGroup:
+        if category != self.MEMBER:
+            raise NotImplementedError(category)
+        return FakeMembersGroup(self, int(guild_id))
+
+    async def clear_all_members(self, guild: discord.abc.Snowflake) -> None:
+        await FakeMembersGroup(self, guild.id)._write({})
+
+    async def all_guilds(self) -> dict[int, dict[str, Any]]:
+        return await self._all("GUILD")
+
+    async def all_members(self) -> dict[int, dict[int, dict[str, Any]]]:
+        members: dict[int, dict[int, dict[str, Any]]] = {}
+        for (_, guild_id, member_id), data in (await self._all("MEMBER")).items():
+            members.setdefault(guild_id, {})[member_id] = data
+        return members
+
+    async def _all(self, category: str) -> dict:
+        self.stats.reads += 1
+        defaults = self.defaults.get(category, {})
+        # guilds are keyed by ID, members by their whole scope.
+        return {
+            scope[1] if category == self.GUILD else scope: copy.deepcopy(
+                {**defaults, **data},
+            )
+            for scope, data in self.data.items()
+            if scope[0] == category
+        }
+
+    async def _get(
+        self,
+        scope: tuple,
+        path: tuple[str, ...],
+        default: Any = ...,
+    ) -> Any:
+        self.stats.reads += 1
+        node: Any = {**self.defaults.get(scope[0], {}), **self.data.get(scope, {})}
+        for key in path:
+            try:
+                node = node[key]
+            except (KeyError, TypeError):
+                if default is ...:
+                    raise KeyError(key) from None
+                return default
+        return copy.deepcopy(node)
+
+    async def _set(self, scope: tuple, path: tuple[str, ...], value: Any) -> None:
+        self.stats.writes += 1
+        self.stats.bytes_written += len(json.dumps(value))
+        if not path:
+            self.data[scope] = copy.deepcopy(value)
+            return
+
+        node = self.data.setdefault(scope, {})
+        defaults = self.defaults.get(scope[0], {})
+        for key in path[:-1]:
+            if key not in node:
+                default = defaults.get(key)
+                node[key] = copy.deepcopy(default) if isinstance(default, dict) else {}
+            node = node[key]
+            defaults = {}
+        node[path[-1]] = copy.deepcopy(value)
+
+    async def _clear(self, scope: tuple, path: tuple[str, ...]) -> None:
+        self.stats.writes += 1
+        if not path:
+            self.data.pop(scope, None)
+            return
+
+        node = self.data.get(scope, {})
+        for key in path[:-1]:
+            node = node.get(key, {})
+        node.pop(path[-1], None)
+
+
+@dataclass
+class ApiCalls:
+    """Discord API calls made through the fakes, counted by endpoint."""
+
+    calls: Counter[str] = field(default_factory=Counter)
+    latency: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    async def __call__(self, endpoint: str) -> None:
+        self.calls[endpoint] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakeAsset:
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+
+class FakeUser:
+    def __init__(self, name: str, *, bot: bool = False) -> None:
+        self.id = next_id()
+        self.name = name
+        self.nick = None
+        self.bot = bot
+        self.display_avatar = FakeAsset(f"https://cdn.example/{self.id}.png")
+        self.mention = f"<@{self.id}>"
+
+
+class FakeGuild:
+    def __init__(self, name: str = "guild", api: ApiCalls | None = None) -> None:
+        self.id = next_id()
+        self.name = name
+        self.api = api or ApiCalls()
+        self.members: dict[int, FakeMember] = {}
+        self.roles: dict[int, FakeRole] = {}
+        self.channels: dict[int, FakeTextChannel] = {}
+        self.me = FakeUser("me", bot=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+    def get_member(self, member_id: int) -> FakeMember | None:
+        return self.members.get(member_id)
+
+    def get_role(self, role_id: int | None) -> FakeRole | None:
+        return self.roles.get(role_id)  # type: ignore[arg-type]
+
+    def get_channel(self, channel_id: int | None) -> FakeTextChannel | None:
+        return self.channels.get(channel_id)  # type: ignore[arg-type]
+
+    def add_member(self) -> FakeMember:
+        member = FakeMember(self, next_id())
+        self.members[member.id] = member
+        return member
+
+    def add_role(self, name: str) -> FakeRole:
+        role = FakeRole(self, name)
+        self.roles[role.id] = role
+        return role
+
+    def add_channel(self, bot_user: FakeUser) -> FakeTextChannel:
+        channel = FakeTextChannel(self.api, self, bot_user)
+        self.channels[channel.id] = channel
+        return channel
+
+
+class FakeRole:
+    def __init__(self, guild: FakeGuild, name: str) -> None:
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.mention = f"<@&{self.id}>"
+        self.holders: set[int] = set()
+
+    def __str__(self) -> str:
+        return self.name
+
+    @property
+    def members(self) -> list[FakeMember]:
+        # like discord.py, this goes through every member of the guild.
+        members = self.guild.members.values()
+        return [member for member in members if member.id in self.holders]
+
+
+class FakeMember:
+    """A guild member, kept small so a million of them fit in memory."""
+
+    __slots__ = ("guild", "id")
+
+    def __init__(self, guild: FakeGuild, member_id: int) -> None:
+        self.guild = guild
+        self.id = member_id
+
+    def __str__(self) -> str:
+        return f"member {self.id}"
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    @property
+    def roles(self) -> list[FakeRole]:
+        return [role for role in self.guild.roles.values() if self.id in role.holders]
+
+    async def add_roles(self, *roles: FakeRole) -> None:
+        await self.guild.api("member.add_roles")
+        for role in roles:
+            role.holders.add(self.id)
+
+    async def remove_roles(self, *roles: FakeRole) -> None:
+        await self.guild.api("member.remove_roles")
+        for role in roles:
+            role.holders.discard(self.id)
+
+
+class FakeBot:
+    def __init__(self, user: FakeUser | None = None) -> None:
+        self.user = user or FakeUser("bot", bot=True)
+        self.guilds: dict[int, FakeGuild] = {}
+
+    def get_guild(self, guild_id: int) -> FakeGuild | None:
+        return self.guilds.get(guild_id)
+
+    def is_ready(self) -> bool:
+        return True
+
+    async def wait_until_ready(self) -> None:
+        return
+
+    async def is_owner(self, user: object) -> bool:
+        return user is self.user
+
+
+class FakeWebhook:
+    def __init__(self, api: ApiCalls, name: str, user: FakeUser | None) -> None:
+        self.api = api
+        self.name = name
+        self.user = user
+        self.token = str(next_id())
+
+    async def send(self, *_: object, **__: object) -> None:
+        await self.api("webhook.send")
+
+
+class FakeTextChannel:
+    """Passes `isinstance(channel, discord.TextChannel)` like a real channel."""
+
+    __class__ = discord.TextChannel  # type: ignore[assignment]
+
+    def __init__(self, api: ApiCalls, guild: FakeGuild, bot_user: FakeUser) -> None:
+        self.api = api
+        self.id = next_id()
+        self.guild = guild
+        self.bot_user = bot_user
+        self.mention = f"<#{self.id}>"
+        self.hooks: list[FakeWebhook] = []
+        self.sent: int = 0
+        self.permissions = SimpleNamespace(manage_messages=True)
+
+    def __str__(self) -> str:
+        return f"#{self.id}"
+
+    def permissions_for(self, _: object) -> SimpleNamespace:
+        return self.permissions
+
+    async def send(self, *_: object, **__: object) -> None:
+        self.sent += 1
+        await self.api("channel.send")
+
+    async def webhooks(self) -> list[FakeWebhook]:
+        await self.api("channel.webhooks")
+        return list(self.hooks)
+
+    async def create_webhook(self, *, name: str) -> FakeWebhook:
+        await self.api("channel.create_webhook")
+        webhook = FakeWebhook(self.api, name, self.bot_user)
+        self.hooks.append(webhook)
+        return webhook
+
+
+class FakeResponse:
+    def __init__(self, api: ApiCalls) -> None:
+        self.api = api
+        self.content: str | None = None
+
+    async def send_message(self, content: str | None = None, **_: object) -> None:
+        self.content = content
+        await self.api("interaction.response")
+
+    async def defer(self, **_: object) -> None:
+        await self.api("interaction.defer")
+
+
+class FakeInteraction:
+    def __init__(self, api: ApiCalls, guild: FakeGuild, user: object) -> None:
+        self.guild = guild
+        self.user = user
+        self.response = FakeResponse(api)
+
+
+class FakeMessage:
+    def __init__(
+        self,
+        channel: FakeTextChannel,
+        author: FakeUser,
+        content: str,
+    ) -> None:
+        self.id = next_id()
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.webhook_id = None
+
+    async def delete(self) -> None:
+        await self.channel.api("message.delete")
@@ -0,0 +1,97 @@
+"""Measure how Lemlang translation throughput scales with message length.
+
+Run with `python -m benchmarks.lemlang_engine`. Compares the tokenizing engine
+with the previous approach of scanning the word list and calling
+`str.replace` on the whole message for every translated word.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from lemlang import vocabulary
+from lemlang.engine import translate
+
+LENGTHS = [16, 64, 256, 1024, 4000]
+
+
+def legacy_translate(content: str, dictionary: dict[str, str], words: list[str]) -> str:
+    possible_replacements: set[str] = set()
+    for word in content.split():
+        if translation := dictionary.get(word.casefold()):
+            content = content.replace(word, translation)
+        elif word in words:
+            possible_replacements.add(word.casefold())
+
+    if possible_replacements:
+        word = random.choice(list(possible_replacements))
+        content = content.replace(word, random.choice(words))
+    return content
+
+
+def make_message(words: list[str], length: int, rng: random.Random) -> str:
+    parts: list[str] = []
+    size = 0
+    while size < length:
+        word = rng.choice(words) + rng.choice(["", "", "", ",", ".", "!"])
+        parts.append(word)
+        size += len(word) + 1
+    return " ".join(parts)[:length]
+
+
+def best_of(repeat: int, number: int, func: object, *args: object) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)  # type: ignore[operator]
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dictionary-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocab = vocabulary.load()
+    words = [vocab[i] for i in range(len(vocab))]
+    dictionary = {
+        word.casefold(): rng.choice(words)
+        for word in rng.sample(words, args.dictionary_size)
+    }
+
+    print(f"dictionary size {len(dictionary)}, best of {args.repeat}")
+    print(f"{'length':>8} {'legacy':>14} {'engine':>14} {'speedup':>8}")
+    for length in LENGTHS:
+        message = make_message(words, length, rng)
+        legacy = best_of(
+            args.repeat,
+            args.number,
+            legacy_translate,
+            message,
+            dictionary,
+            words,
+        )
+        engine = best_of(
+            args.repeat,
+            args.number,
+            translate,
+            message,
+            dictionary,
+            vocab,
+            lambda _: vocab.choice(rng),
+        )
+        print(
+            f"{length:>8} {length / legacy / 1e6:>9.2f} MB/s"
+            f" {length / engine / 1e6:>9.2f} MB/s {legacy / engine:>7.1f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
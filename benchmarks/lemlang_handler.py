@@ -0,0 +1,275 @@
+"""Replay synthetic traffic through the Lemlang message handler, offline.
+
+Run with `python -m benchmarks.lemlang_handler`. The cog runs against the
+fakes in `benchmarks.fakes`, so no Discord connection or Red instance is
+needed. Starting from a base scenario, each of message length, dictionary
+size and number of concurrent guilds is varied in turn. For every scenario
+this reports p50/p99 handler latency, net memory allocated per message (from
+tracemalloc, in a separate pass so tracing does not skew the timings), and
+Config writes and bytes written per message, including the final flush.
+
+Results are saved as JSON with `--output`. Passing a previous file with
+`--compare` prints the change for each scenario and exits with status 1
+if any metric regressed by more than `--threshold`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from benchmarks.fakes import (
+    ApiCalls,
+    FakeConfig,
+    FakeGuild,
+    FakeMessage,
+    FakeTextChannel,
+    FakeUser,
+)
+from lemlang import cog as lemlang_cog
+from lemlang import vocabulary
+
+BASE = {"length": 256, "dictionary_size": 1000, "guilds": 1}
+LENGTHS = [16, 64, 256, 1024, 2000]
+DICTIONARY_SIZES = [0, 1000, 10_000, 100_000]
+GUILDS = [1, 4, 16, 64]
+
+# metrics compared between runs, all lower is better
+METRICS = ["p50_ms", "p99_ms", "alloc_kib_per_message", "config_bytes_per_message"]
+
+
+def scenarios() -> list[dict[str, int]]:
+    found: list[dict[str, int]] = [BASE]
+    for key, values in [
+        ("length", LENGTHS),
+        ("dictionary_size", DICTIONARY_SIZES),
+        ("guilds", GUILDS),
+    ]:
+        for value in values:
+            scenario = {**BASE, key: value}
+            if scenario not in found:
+                found.append(scenario)
+    return found
+
+
+def scenario_name(scenario: dict[str, int]) -> str:
+    return (
+        f"len={scenario['length']} dict={scenario['dictionary_size']}"
+        f" guilds={scenario['guilds']}"
+    )
+
+
+def make_dictionary(words: list[str], size: int) -> dict[str, list]:
+    """Build a saved dictionary of `size` entries in the compact Config form.
+
+    Real words come first, so messages hit the dictionary, followed by
+    numbered variants once the vocabulary runs out.
+    """
+    dictionary: dict[str, list] = {}
+    for index in range(size):
+        word = words[index % len(words)]
+        if index >= len(words):
+            word = f"{word}{index}"
+        dictionary[word.casefold()] = [f"lem{index}", 0, 0, 0]
+    return dictionary
+
+
+def make_message(words: list[str], length: int, rng: random.Random) -> str:
+    parts: list[str] = []
+    size = 0
+    while size < length:
+        word = rng.choice(words) + rng.choice(["", "", "", ",", ".", "!"])
+        parts.append(word)
+        size += len(word) + 1
+    return " ".join(parts)[:length]
+
+
+class Harness:
+    """One Lemlang cog with its own fake Config, guilds and channels."""
+
+    def __init__(self, scenario: dict[str, int], api_latency: float) -> None:
+        self.api = ApiCalls(latency=api_latency)
+        self.bot = mock.Mock()
+        self.bot.user = FakeUser("Lemlang", bot=True)
+        with mock.patch.object(lemlang_cog, "Config", FakeConfig):
+            self.cog = lemlang_cog.Lemlang(self.bot)
+        self.config: FakeConfig = self.cog.config  # type: ignore[assignment]
+
+        words = vocabulary.load()
+        self.words = [words[i] for i in range(len(words))]
+        dictionary = make_dictionary(self.words, scenario["dictionary_size"])
+
+        self.channels: list[FakeTextChannel] = []
+        for number in range(scenario["guilds"]):
+            guild = FakeGuild(f"guild {number}")
+            channel = FakeTextChannel(self.api, guild, self.bot.user)
+            self.config.data[("GUILD", guild.id)] = {
+                "channel_id": channel.id,
+                "dictionary": copy.deepcopy(dictionary),
+            }
+            self.channels.append(channel)
+        self.authors = [FakeUser(f"user {number}") for number in range(8)]
+
+    async def warm_up(self, rng: random.Random) -> None:
+        """Load each guild's dictionary and webhook before anything is measured."""
+        for channel in self.channels:
+            await self.cog.on_message_without_command(
+                FakeMessage(
+                    channel,
+                    self.authors[0],
+                    make_message(self.words, 16, rng),
+                ),
+            )
+        self.config.stats.reset()
+        self.api.calls.clear()
+
+    async def replay(
+        self,
+        messages: int,
+        length: int,
+        rng: random.Random,
+    ) -> list[float]:
+        """Send `messages` messages spread across every guild at once."""
+        latencies: list[float] = []
+        per_guild = max(1, messages // len(self.channels))
+        contents = [
+            [make_message(self.words, length, rng) for _ in range(per_guild)]
+            for _ in self.channels
+        ]
+
+        async def guild_traffic(channel: FakeTextChannel, texts: list[str]) -> None:
+            for text in texts:
+                message = FakeMessage(channel, rng.choice(self.authors), text)
+                start = time.perf_counter()
+                await self.cog.on_message_without_command(message)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(
+            *(
+                guild_traffic(channel, texts)
+                for channel, texts in zip(self.channels, contents, strict=True)
+            ),
+        )
+        return latencies
+
+    async def close(self) -> None:
+        await self.cog.cog_unload()
+
+
+async def run_scenario(
+    scenario: dict[str, int],
+    messages: int,
+    api_latency: float,
+    seed: int,
+) -> dict[str, Any]:
+    harness = Harness(scenario, api_latency)
+    rng = random.Random(seed)
+    await harness.warm_up(rng)
+
+    latencies = await harness.replay(messages, scenario["length"], rng)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    traced = await harness.replay(messages, scenario["length"], rng)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(
+        max(stat.size_diff, 0) for stat in after.compare_to(before, "lineno")
+    )
+
+    # writes are batched, so count them after the store's final flush.
+    await harness.close()
+    handled = len(latencies) + len(traced)
+    stats = harness.config.stats
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "scenario": scenario,
+        "messages": handled,
+        "p50_ms": quantiles[49] * 1e3,
+        "p99_ms": quantiles[98] * 1e3,
+        "alloc_kib_per_message": allocated / len(traced) / 1024,
+        "config_writes_per_message": stats.writes / handled,
+        "config_bytes_per_message": stats.bytes_written / handled,
+        "api_calls_per_message": harness.api.total / handled,
+    }
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> bool:
+    """Print the change from `baseline` per scenario, returning True on regression."""
+    previous = {scenario_name(result["scenario"]): result for result in baseline}
+    regressed = False
+    print(f"\nchange from baseline (regression above {threshold:.0%})")
+    for result in results:
+        name = scenario_name(result["scenario"])
+        if (old := previous.get(name)) is None:
+            continue
+        changes = []
+        for metric in METRICS:
+            if not old[metric]:
+                continue
+            change = result[metric] / old[metric] - 1
+            flag = ""
+            if change > threshold:
+                regressed = True
+                flag = " !"
+            changes.append(f"{metric} {change:+.0%}{flag}")
+        print(f"  {name:32} " + ", ".join(changes))
+    return regressed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--api-latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = []
+    print(
+        f"{'scenario':32} {'p50':>9} {'p99':>9} {'alloc/msg':>11}"
+        f" {'writes/msg':>10} {'bytes/msg':>10} {'api/msg':>8}",
+    )
+    for scenario in scenarios():
+        result = await run_scenario(
+            scenario,
+            args.messages,
+            args.api_latency,
+            args.seed,
+        )
+        results.append(result)
+        print(
+            f"{scenario_name(scenario):32}"
+            f" {result['p50_ms']:7.3f}ms {result['p99_ms']:7.3f}ms"
+            f" {result['alloc_kib_per_message']:7.2f}KiB"
+            f" {result['config_writes_per_message']:10.2f}"
+            f" {result['config_bytes_per_message']:10.1f}"
+            f" {result['api_calls_per_message']:8.2f}",
+        )
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
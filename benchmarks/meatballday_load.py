@@ -0,0 +1,204 @@
+"""Simulate a year of Meatball Day checks over a large population, offline.
+
+Run with `python -m benchmarks.meatballday_load`. The cog runs against the
+fakes in `benchmarks.fakes` with a simulated clock: instead of sleeping, the
+clock jumps straight to the next guild that is due, so a year of scheduled
+checks runs as fast as the checks themselves. Guilds are spread over a
+handful of timezones, and every member has a random Meatball Day.
+
+For each simulated day this records wall time, Discord API calls, Config
+reads and writes, and peak memory allocated during the checks (from
+tracemalloc, started after setup). Tracing memory slows everything down,
+so compare wall times from runs with `--no-trace-memory`. It prints a
+summary, the costliest days, and the cost of /meatball-next. With
+`--outage` the bot is taken down for a few days mid-year, to show that
+missed checks are caught up once.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from unittest import mock
+
+import pendulum
+
+from benchmarks.fakes import ApiCalls, FakeBot, FakeConfig, FakeGuild, FakeInteraction
+from meatballday import cog as meatballday_cog
+
+TIMEZONES = [
+    "America/Los_Angeles",
+    "America/New_York",
+    "America/Sao_Paulo",
+    "Europe/London",
+    "Europe/Berlin",
+    "Asia/Kolkata",
+    "Asia/Tokyo",
+    "Australia/Sydney",
+]
+OUTAGE_DAYS = 3
+
+
+@dataclass
+class DayStats:
+    date: pendulum.Date
+    wall: float = 0.0
+    batches: int = 0
+    api_calls: int = 0
+    config_reads: int = 0
+    config_writes: int = 0
+    peak_memory: int = 0
+
+
+class Simulation:
+    def __init__(self, guilds: int, members: int, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.api = ApiCalls()
+        self.bot = FakeBot()
+        self.now = pendulum.datetime(2026, 1, 1, tz="UTC")
+        with mock.patch.object(meatballday_cog, "Config", FakeConfig):
+            self.cog = meatballday_cog.MeatballDay(self.bot, clock=lambda: self.now)
+        self.config: FakeConfig = self.cog.config  # type: ignore[assignment]
+
+        per_guild = max(1, members // guilds)
+        for number in range(guilds):
+            guild = FakeGuild(f"guild {number}", self.api)
+            role = guild.add_role("Meatball Day")
+            channel = guild.add_channel(self.bot.user)
+            self.bot.guilds[guild.id] = guild
+            self.config.data[("GUILD", guild.id)] = {
+                "channel": channel.id,
+                "role": role.id,
+                "timezone": self.rng.choice(TIMEZONES),
+            }
+            for _ in range(per_guild):
+                member = guild.add_member()
+                date = pendulum.date(2024, 1, 1).add(days=self.rng.randrange(366))
+                self.config.data[("MEMBER", guild.id, member.id)] = {
+                    "month": date.month,
+                    "day": date.day,
+                }
+
+    async def load(self) -> float:
+        start = time.perf_counter()
+        await self.cog.cog_load()
+        # the check loop sleeps on real time, the simulation drives checks itself.
+        if self.cog.task is not None:
+            self.cog.task.cancel()
+        return time.perf_counter() - start
+
+    async def run_day(self) -> DayStats:
+        """Run every check due before the next UTC midnight, jumping between them."""
+        stats = DayStats(self.now.date())
+        end = self.now.start_of("day").add(days=1)
+        api_calls = self.api.total
+        reads, writes = self.config.stats.reads, self.config.stats.writes
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        traced = tracemalloc.get_traced_memory()[0]
+
+        while (next_due := self.cog.scheduler.next_due()) is not None:
+            if next_due >= end.timestamp():
+                break
+            self.now = max(self.now, pendulum.from_timestamp(next_due))
+            start = time.perf_counter()
+            await self.cog._run_due_checks()
+            stats.wall += time.perf_counter() - start
+            stats.batches += 1
+
+        self.now = end
+        stats.api_calls = self.api.total - api_calls
+        stats.config_reads = self.config.stats.reads - reads
+        stats.config_writes = self.config.stats.writes - writes
+        stats.peak_memory = tracemalloc.get_traced_memory()[1] - traced
+        return stats
+
+    async def meatball_next(self, calls: int, count: int) -> float:
+        guilds = list(self.bot.guilds.values())
+        start = time.perf_counter()
+        for _ in range(calls):
+            guild = self.rng.choice(guilds)
+            interaction = FakeInteraction(self.api, guild, self.bot.user)
+            await self.cog.meatball_next.callback(self.cog, interaction, count)
+        return (time.perf_counter() - start) / calls
+
+
+def report(days: list[DayStats], top: int) -> None:
+    def summary(name: str, values: list[float], unit: str = "") -> None:
+        print(
+            f"  {name:16} total {sum(values):12.1f}{unit}"
+            f"  mean {statistics.fmean(values):10.2f}{unit}"
+            f"  max {max(values):10.1f}{unit}",
+        )
+
+    print(f"\n{len(days)} simulated days")
+    summary("wall time (s)", [day.wall for day in days])
+    summary("API calls", [day.api_calls for day in days])
+    summary("Config reads", [day.config_reads for day in days])
+    summary("Config writes", [day.config_writes for day in days])
+    summary("peak MiB", [day.peak_memory / 2**20 for day in days])
+    summary("check batches", [day.batches for day in days])
+
+    print(f"\ncostliest {top} days by wall time")
+    for day in sorted(days, key=lambda day: day.wall, reverse=True)[:top]:
+        print(
+            f"  {day.date}  {day.wall:7.3f}s  {day.batches:3} batches"
+            f"  {day.api_calls:6} API calls  {day.config_reads:7} reads"
+            f"  {day.config_writes:6} writes  {day.peak_memory / 2**20:7.1f}MiB",
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--guilds", type=int, default=10_000)
+    parser.add_argument("--members", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--outage", action="store_true")
+    parser.add_argument("--next-calls", type=int, default=1000)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--trace-memory",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+    )
+    args = parser.parse_args()
+
+    logging.getLogger("red.casper_cogs.meatball_day").setLevel(logging.WARNING)
+
+    start = time.perf_counter()
+    simulation = Simulation(args.guilds, args.members, args.seed)
+    print(
+        f"built {args.guilds} guilds and {args.members} members"
+        f" in {time.perf_counter() - start:.1f}s",
+    )
+    print(f"cog_load took {await simulation.load():.2f}s")
+
+    if args.trace_memory:
+        tracemalloc.start()
+    days: list[DayStats] = []
+    for day in range(args.days):
+        if args.outage and day == args.days // 2:
+            simulation.now = simulation.now.add(days=OUTAGE_DAYS)
+            print(f"bot down for {OUTAGE_DAYS} days until {simulation.now.date()}")
+        days.append(await simulation.run_day())
+    tracemalloc.stop()
+    report(days, args.top)
+
+    for count in (1, meatballday_cog.MAX_NEXT):
+        per_call = await simulation.meatball_next(args.next_calls, count)
+        print(f"\n/meatball-next count={count}: {per_call * 1e6:.1f}us per call")
+    print(f"\nAPI calls by endpoint: {dict(simulation.api.calls)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
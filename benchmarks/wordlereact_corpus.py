@@ -0,0 +1,91 @@
+"""Messages used to benchmark the WordleReact patterns.
+
+Shares are copied from the games' share buttons, chat is the sort of thing
+people say around them, and adversarial inputs are built to make the worst
+patterns backtrack as much as Discord's message length limit allows.
+"""
+
+from __future__ import annotations
+
+MESSAGE_LIMIT = 4000
+
+SHARES = [
+    "Wordle 1,034 3/6\n\n⬛🟨⬛⬛⬛\n⬛🟩🟨⬛🟨\n🟩🟩🟩🟩🟩",
+    "Wordle 1,035 1/6\n\n🟩🟩🟩🟩🟩",
+    (
+        "Wordle 1,036 X/6\n\n⬛⬛⬛⬛⬛\n⬛🟨⬛⬛⬛\n⬛🟩🟩⬛🟩\n"
+        "⬛🟩🟩⬛🟩\n⬛🟩🟩⬛🟩\n🟨🟩🟩⬛🟩"
+    ),
+    (
+        "Daily Duotrigordle #712\nGuesses: 35/37\nScore: 1043\n"
+        "4️⃣1️⃣1️⃣3️⃣\n2️⃣3️⃣0️⃣9️⃣\nhttps://duotrigordle.com/"
+    ),
+    "Scholardle 612 2/6\n\n🟨⬛⬛🟨⬛⬛\n🟩🟩🟩🟩🟩🟩",
+    (
+        "#Worldle #812 (14.04.2024) 2/6 (100%)\n🟩🟩🟩🟨⬜↗️\n🟩🟩🟩🟩🟩🎉\n"
+        "https://worldle.teuteuf.fr"
+    ),
+    (
+        "#waffle807 5/5\n\n🟩🟩🟩🟩🟩\n🟩⭐️🟩⭐️🟩\n🟩🟩⭐️🟩🟩\n🟩⭐️🟩⭐️🟩\n"
+        "🟩🟩🟩🟩🟩\n\n🔥 streak: 31\n#wafflegoldteam\nwafflegame.net"
+    ),
+    "Flowdle 512 [14 moves]\n🟩🟩🟩🟨",
+    "Jurassic Wordle (Game #231) - 4 / 8\n⬜🟨⬜⬜⬜\n🟩🟩🟩🟩🟩",
+    "Framed #712\n🎥 🟥 🟥 🟩 ⬛ ⬛ ⬛\n\nhttps://framed.wtf",
+    "Framed #713\n🎥 🟥 🟥 🟥 🟥 🟥 🟥\n\nhttps://framed.wtf",
+    "Moviedle #2024-04-14 \n\n 🎥🟥🟥⬜️🟩⬜️⬜️\n\n https://likewise.com/games/moviedle",
+    (
+        "Posterdle #2024-04-14 \n\n ⌛ 0️⃣ 5️⃣ 🔥 \n 🍿 🟩⬜️⬜️⬜️⬜️⬜️\n\n"
+        "https://likewise.com/games/posterdle"
+    ),
+    "#Heardle #412\n\n🔉🟥🟩⬜️⬜️⬜️⬜️\n\n#Heardle #Heardle5",
+    "Flaggle 🇫🇷🇩🇪🇮🇹 2024-04-14\n🏳️ 8 pts",
+    "#Polygonle 612 4/6\n🟧🟦🟦🟦🟦\n🟧🟧🟦🟦🟦\n🟩🟩🟩🟩🟩",
+    "#GuessTheGame #712\n\n🎮 🟥 🟨 🟩 ⬜ ⬜ ⬜\n\n#ProperGaming",
+    (
+        "I played https://squaredle.app/ 4/14: I found all 31 words! 4:32\n"
+        "📖 3 bonus words\n⏱️ 4:32\n🎯 Accuracy: 94%\n🔥 21 day streak"
+    ),
+    "Episode #412\n\n📺 🟥🟥🟩⬛⬛⬛\n\nhttps://episode.wtf",
+    "Birdle #312 3/5\n🟥🟥🟩",
+]
+
+CHAT = [
+    "lol",
+    "did anyone else get today's wordle? took me forever",
+    "I'm going to make waffles for breakfast",
+    "good morning everyone!",
+    "has anyone tried the new heardle? the songs are way too obscure",
+    "see you all at the meetup on saturday, bring snacks",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "ok but what if the framed answer was actually a different movie",
+    "The quick brown fox jumps over the lazy dog. " * 20,
+    "🟩🟩🟩🟩🟩 " * 30,
+]
+
+
+def _fill(prefix: str, unit: str) -> str:
+    return prefix + unit * ((MESSAGE_LIMIT - len(prefix)) // len(unit))
+
+
+ADVERSARIAL = [
+    _fill("", "https://squaredle.app/ "),
+    _fill("https://squaredle.app/ ", "a"),
+    _fill("", "framed #1 "),
+    _fill("framed #", "1"),
+    _fill("moviedle #", "-"),
+    _fill("", "posterdle #1\n ⌛ "),
+    _fill("", "heardle #1 "),
+    _fill("", "#Polygonle 1 1/6 "),
+    _fill("#Polygonle 1 1/6", "x"),
+    _fill("", "#GuessTheGame #1 "),
+    _fill("", "flaggle \n"),
+    _fill("", "wordle "),
+    _fill("Episode #1\n📺 ", "🟥"),
+]
+
+CORPUS = {
+    "shares": SHARES,
+    "chat": CHAT,
+    "adversarial": ADVERSARIAL,
+}
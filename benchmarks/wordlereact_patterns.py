@@ -0,0 +1,77 @@
+"""Time the WordleReact patterns against a corpus of real and hostile messages.
+
+Run with `python -m benchmarks.wordlereact_patterns`. Prints the slowest
+patterns per corpus category, then compares the keyword-gated matcher with
+running every pattern on every message.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.wordlereact_corpus import CORPUS
+from wordlereact.cog import reactions
+from wordlereact.matcher import Matcher, re_compile
+from wordlereact.registry import MAX_CONTENT_LENGTH
+
+
+def best_of(repeat: int, func: object, *args: object) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)  # type: ignore[operator]
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report_patterns(table: list, repeat: int, top: int) -> None:
+    for category, messages in CORPUS.items():
+        timings = []
+        for pattern, emoji in table:
+            worst = max(
+                best_of(repeat, pattern.search, message) for message in messages
+            )
+            timings.append((worst, pattern.pattern, emoji))
+
+        timings.sort(reverse=True)
+        print(f"\n{category}: slowest patterns (worst message, best of {repeat})")
+        for worst, pattern, emoji in timings[:top]:
+            print(f"  {worst * 1e6:10.1f}us  {emoji}  {pattern}")
+
+
+def report_matcher(table: list, repeat: int) -> None:
+    matcher = Matcher(table, max_length=MAX_CONTENT_LENGTH)
+
+    def naive(messages: list[str]) -> None:
+        for message in messages:
+            for pattern, _ in table:
+                pattern.search(message)
+
+    def gated(messages: list[str]) -> None:
+        for message in messages:
+            matcher.match(message)
+
+    print("\nper-message cost: every pattern vs keyword-gated matcher")
+    for category, messages in CORPUS.items():
+        naive_time = best_of(repeat, naive, messages) / len(messages)
+        gated_time = best_of(repeat, gated, messages) / len(messages)
+        print(
+            f"  {category:12} {naive_time * 1e6:10.1f}us"
+            f" {gated_time * 1e6:10.1f}us",
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args()
+
+    table = [(re_compile(pattern), emoji) for pattern, emoji in reactions]
+    report_patterns(table, args.repeat, args.top)
+    report_matcher(table, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
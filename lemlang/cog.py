@@ -1,31 +1,167 @@
 from __future__ import annotations
 
-import random
-from pathlib import Path
-import re
+import asyncio
+import bisect
+import json
+import tempfile
+import time
 
 import discord
 from redbot.core import Config, app_commands, commands
 
-words_path = Path(__file__).parent.resolve() / "data/oxford3k.txt"
+from lemlang import vocabulary
+from lemlang.engine import detranslate, translate
+from lemlang.outbound import Outbound
+from lemlang.settings import MISSING, GuildSetting, GuildSettings
+from lemlang.store import DictionaryStore, Eviction, GuildDictionary
+
+PAGE_SIZE = 5
+# exports larger than this are spooled to disk instead of memory
+EXPORT_SPOOL_SIZE = 1024 * 1024
+
+
+class DictionarySearchModal(discord.ui.Modal):
+    query = discord.ui.TextInput(
+        label="Word",
+        placeholder="Jump to the first word starting with...",
+        min_length=1,
+        max_length=100,
+    )
+
+    def __init__(self, view: DictionaryView) -> None:
+        self.view = view
+        super().__init__(title="Search the dictionary")
+
+    async def on_submit(self, interaction: discord.Interaction) -> None:
+        self.view.seek(self.query.value.casefold())
+        await interaction.response.edit_message(
+            content=self.view.render(),
+            view=self.view,
+        )
+
+
+class DictionaryView(discord.ui.View):
+    """Pages through a guild's dictionary in alphabetical order.
+
+    The position is kept as the first word on the page rather than a page
+    number, so words added while the view is open do not shift it.
+    """
+
+    def __init__(self, dictionary: GuildDictionary, page: int) -> None:
+        super().__init__(timeout=300)
+        self.dictionary = dictionary
+        words = dictionary.sorted_words()
+        start = min(PAGE_SIZE * page, (len(words) - 1) // PAGE_SIZE * PAGE_SIZE)
+        self.cursor = words[start] if words else ""
+
+    def start(self) -> int:
+        words = self.dictionary.sorted_words()
+        start = bisect.bisect_left(words, self.cursor)
+        return start - start % PAGE_SIZE
+
+    def seek(self, word: str) -> None:
+        words = self.dictionary.sorted_words()
+        if not words:
+            return
+        start = min(bisect.bisect_left(words, word), len(words) - 1)
+        self.cursor = words[start - start % PAGE_SIZE]
+
+    def move(self, pages: int) -> None:
+        words = self.dictionary.sorted_words()
+        if not words:
+            return
+        start = self.start() + pages * PAGE_SIZE
+        start = max(0, min(start, (len(words) - 1) // PAGE_SIZE * PAGE_SIZE))
+        self.cursor = words[start]
+
+    def render(self) -> str:
+        words = self.dictionary.sorted_words()
+        if not words:
+            return "The Lemlang dictionary is empty!"
+
+        start = self.start()
+        pages = -(-len(words) // PAGE_SIZE)
+        lines = "\n".join(
+            f"{word} → {self.dictionary.entries[word]}"
+            for word in words[start : start + PAGE_SIZE]
+        )
+        return f"{lines}\n\n*Page {start // PAGE_SIZE + 1}/{pages}*"
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(
+        self,
+        interaction: discord.Interaction,
+        _: discord.ui.Button,
+    ) -> None:
+        self.move(-1)
+        await interaction.response.edit_message(content=self.render(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(
+        self,
+        interaction: discord.Interaction,
+        _: discord.ui.Button,
+    ) -> None:
+        self.move(1)
+        await interaction.response.edit_message(content=self.render(), view=self)
+
+    @discord.ui.button(label="Search", style=discord.ButtonStyle.primary)
+    async def search(
+        self,
+        interaction: discord.Interaction,
+        _: discord.ui.Button,
+    ) -> None:
+        await interaction.response.send_modal(DictionarySearchModal(self))
 
 
 class Lemlang(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.config = Config.get_conf(self, identifier=89226147595173940821)
-        self.config.register_guild(channel_id=None, dictionary={})
-        self.words = [
-            word.strip().replace(" ", "-")
-            for word in words_path.read_text().splitlines()
-        ]
+        self.config.register_guild(
+            channel_id=None,
+            dictionary={},
+            vocabulary=vocabulary.DEFAULT_VOCABULARY,
+            sampler=None,
+            max_size=None,
+            eviction=Eviction.LRU.value,
+        )
+        self.settings = GuildSettings(self.config)
+        self.channel_id: GuildSetting[int | None] = self.settings.add("channel_id")
+        self.vocabulary_name: GuildSetting[str] = self.settings.add("vocabulary")
+        self.dictionaries = DictionaryStore(self.config)
+        self.outbound = Outbound(bot)
+
+    async def cog_load(self) -> None:
+        self.dictionaries.start()
+
+    async def cog_unload(self) -> None:
+        await self.outbound.close()
+        await self.dictionaries.close()
+
+    async def _vocabulary(self, guild: discord.Guild) -> vocabulary.Vocabulary:
+        if (name := self.vocabulary_name.peek(guild)) is MISSING:
+            name = await self.vocabulary_name.get(guild)
+        if (words := vocabulary.loaded(name)) is not None:
+            return words
+
+        # the first load of each vocabulary reads a file, keep it off the loop.
+        try:
+            return await asyncio.to_thread(vocabulary.load, name)
+        except vocabulary.UnknownVocabularyError:
+            return await asyncio.to_thread(vocabulary.load)
 
     @commands.Cog.listener()
     async def on_message_without_command(self, message: discord.Message) -> None:
-        if message.author.bot:
+        # reposts come from our webhook, so they must not be translated again.
+        if message.author.bot or message.webhook_id is not None:
+            return
+        if message.guild is None:
             return
 
-        channel_id = await self.config.guild(message.guild).channel_id()
+        # after the first message in a guild this needs no await at all.
+        if (channel_id := self.channel_id.peek(message.guild)) is MISSING:
+            channel_id = await self.channel_id.get(message.guild)
         if message.channel.id != channel_id:
             return
 
@@ -34,43 +170,42 @@ class Lemlang(commands.Cog):
         else:
             author = message.author.name
 
-        content = message.content
-
-        dictionary = await self.config.guild(message.guild).dictionary()
-
-        possible_replacements: set[str] = set()
-        for word in content.split():
-            if translation := dictionary.get(word.casefold()):
-                content = content.replace(word, translation)
-            elif word in self.words:
-                possible_replacements.add(word.casefold())
-
-        word: str | None = None
-        translation: str | None = None
-        if possible_replacements:
-            word = random.choice(list(possible_replacements))
-            translation = random.choice(self.words)
-            dictionary[word] = translation
-            content = content.replace(word, translation)
-        await self.config.guild(message.guild).dictionary.set(dictionary)
+        words = await self._vocabulary(message.guild)
+        dictionary = await self.dictionaries.get(message.guild)
+        async with dictionary.lock:
+            result = translate(
+                message.content,
+                dictionary.entries,
+                words,
+                lambda _: dictionary.draw_translation(words),
+            )
+            now = int(time.time())
+            dictionary.touch(result.used, now)
+            if result.word is not None and result.translation is not None:
+                dictionary.add(result.word, result.translation, now)
 
-        await message.delete()
-        await message.channel.send(f"<{author}> {content}")
+        await self.outbound.repost(message, author, result.content)
 
-        if word:
-            await message.channel.send(
-                f'*"{word}" is now translated to "{translation}"!*',
+        if result.word is not None:
+            self.outbound.announce(
+                message.channel,
+                f'*"{result.word}" is now translated to "{result.translation}"!*',
             )
 
     @app_commands.command(name="lemlang-reset")
     async def reset_dictionary(self, interaction: discord.Interaction) -> None:
-        await self.config.guild(interaction.guild).dictionary.set({})
+        dictionary = await self.dictionaries.get(interaction.guild)
+        async with dictionary.lock:
+            dictionary.reset()
+        await self.dictionaries.flush_guild(interaction.guild.id, dictionary)
         await interaction.response.send_message("Dictionary reset!")
 
     @app_commands.command(name="lemlang-dictionary")
-    async def dictionary(self, interaction: discord.Interaction, page: int) -> None:
-        page_size = 5
-
+    async def dictionary(
+        self,
+        interaction: discord.Interaction,
+        page: int = 1,
+    ) -> None:
         if page < 1:
             await interaction.response.send_message(
                 "Page must be greater than 0!",
@@ -78,30 +213,28 @@ class Lemlang(commands.Cog):
             )
             return
 
-        dictionary = await self.config.guild(interaction.guild).dictionary()
-        if not dictionary:
+        dictionary = await self.dictionaries.get(interaction.guild)
+        if not dictionary.entries:
             await interaction.response.send_message(
                 "The Lemlang dictionary is empty!",
                 ephemeral=True,
             )
             return
 
-        items = list(dictionary.items())[page_size * (page - 1) : page_size * page]
+        view = DictionaryView(dictionary, page - 1)
         await interaction.response.send_message(
-            "\n".join(f"{key} → {value}" for key, value in items)
-            + f"\n\n*Page {page}/{len(dictionary) // page_size}*",
+            view.render(),
+            view=view,
             ephemeral=True,
         )
 
     @app_commands.command(name="lemlang-translate")
     async def translate(self, interaction: discord.Interaction, message: str) -> None:
-        dictionary = await self.config.guild(interaction.guild).dictionary()
-        reverse = {value: key for key, value in dictionary.items()}
-        for word in message.split():
-            if translation := reverse.get(word.casefold()):
-                pat = re.compile(rf"\b{word}\b")
-                message = re.sub(pat, translation, message)
-        await interaction.response.send_message(message, ephemeral=True)
+        dictionary = await self.dictionaries.get(interaction.guild)
+        await interaction.response.send_message(
+            detranslate(message, dictionary.reverse),
+            ephemeral=True,
+        )
 
     @app_commands.command(name="lemlang-channel")
     @app_commands.default_permissions(administrator=True)
@@ -110,7 +243,172 @@ class Lemlang(commands.Cog):
         interaction: discord.Interaction,
         channel: discord.TextChannel,
     ) -> None:
-        await self.config.guild(interaction.guild).channel_id.set(channel.id)
+        await self.channel_id.set(interaction.guild, channel.id)
         await interaction.response.send_message(
             f"Set Lemlang channel to {channel.mention}",
         )
+
+    @app_commands.command(name="lemlang-vocabulary")
+    @app_commands.describe(name="The word list new translations are drawn from")
+    @app_commands.default_permissions(administrator=True)
+    async def set_vocabulary(
+        self,
+        interaction: discord.Interaction,
+        name: str,
+    ) -> None:
+        if name not in vocabulary.available():
+            await interaction.response.send_message(
+                f"There is no vocabulary called {name}. Choose from: "
+                + ", ".join(vocabulary.available()),
+                ephemeral=True,
+            )
+            return
+
+        await self.vocabulary_name.set(interaction.guild, name)
+        await interaction.response.send_message(f"Set Lemlang vocabulary to {name}")
+
+    @set_vocabulary.autocomplete("name")
+    async def vocabulary_autocomplete(
+        self,
+        _: discord.Interaction,
+        current: str,
+    ) -> list[app_commands.Choice[str]]:
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in vocabulary.available()
+            if current.casefold() in name.casefold()
+        ][:25]
+
+    @app_commands.command(name="lemlang-limit")
+    @app_commands.describe(
+        size="The most words the dictionary keeps, leave empty for no limit",
+        eviction="Which words are removed first once the limit is reached",
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def set_limit(
+        self,
+        interaction: discord.Interaction,
+        size: app_commands.Range[int, 1] | None = None,
+        eviction: Eviction = Eviction.LRU,
+    ) -> None:
+        group = self.config.guild(interaction.guild)
+        await group.max_size.set(size)
+        await group.eviction.set(eviction.value)
+
+        dictionary = await self.dictionaries.get(interaction.guild)
+        async with dictionary.lock:
+            dictionary.max_size = size
+            dictionary.eviction = eviction
+            evicted = dictionary.evict()
+
+        if size is None:
+            message = "Removed the Lemlang dictionary size limit"
+        else:
+            order = "least recently used" if eviction == Eviction.LRU else "oldest"
+            message = (
+                f"Limited the Lemlang dictionary to {size} words, "
+                f"removing the {order} words first"
+            )
+        if evicted:
+            message += f" ({len(evicted)} removed)"
+        await interaction.response.send_message(message)
+
+    @app_commands.command(name="lemlang-export")
+    @app_commands.default_permissions(administrator=True)
+    async def export_dictionary(self, interaction: discord.Interaction) -> None:
+        """Download the dictionary as JSON lines, one entry per line."""
+        dictionary = await self.dictionaries.get(interaction.guild)
+        with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE) as file:
+            async with dictionary.lock:
+                for word in dictionary.entries:
+                    translation, created, last_used, uses = dictionary.record(word)
+                    line = json.dumps(
+                        {
+                            "word": word,
+                            "translation": translation,
+                            "created": created,
+                            "last_used": last_used,
+                            "uses": uses,
+                        },
+                        ensure_ascii=False,
+                    )
+                    file.write(line.encode() + b"\n")
+                count = len(dictionary.entries)
+
+            file.seek(0)
+            await interaction.response.send_message(
+                f"Exported {count} words",
+                file=discord.File(file, filename="lemlang-dictionary.jsonl"),
+                ephemeral=True,
+            )
+
+    @app_commands.command(name="lemlang-import")
+    @app_commands.describe(file="A dictionary from /lemlang-export")
+    @app_commands.default_permissions(administrator=True)
+    async def import_dictionary(
+        self,
+        interaction: discord.Interaction,
+        file: discord.Attachment,
+    ) -> None:
+        await interaction.response.defer(ephemeral=True)
+        dictionary = await self.dictionaries.get(interaction.guild)
+        imported = skipped = 0
+
+        with tempfile.TemporaryFile() as saved:
+            await file.save(saved)
+            saved.seek(0)
+            async with dictionary.lock:
+                now = int(time.time())
+                for line in saved:
+                    try:
+                        entry = json.loads(line)
+                        word = entry["word"].casefold()
+                        translation = entry["translation"]
+                        created = int(entry.get("created", now))
+                        last_used = int(entry.get("last_used", created))
+                        uses = int(entry.get("uses", 0))
+                    except (
+                        ValueError,
+                        OverflowError,
+                        KeyError,
+                        TypeError,
+                        AttributeError,
+                    ):
+                        skipped += 1
+                        continue
+
+                    if not word or not isinstance(translation, str) or not translation:
+                        skipped += 1
+                        continue
+
+                    # each translation can only belong to one word
+                    owner = dictionary.reverse.get(translation.casefold())
+                    if owner is not None and owner != word:
+                        skipped += 1
+                        continue
+
+                    dictionary.restore(word, translation, created, last_used, uses)
+                    imported += 1
+
+                dictionary.sort_recent()
+                evicted = len(dictionary.evict())
+
+        # save the whole import in one write rather than waiting for a flush.
+        await self.dictionaries.flush_guild(interaction.guild.id, dictionary)
+
+        message = f"Imported {imported} words, skipped {skipped}"
+        if evicted:
+            message += f", then removed {evicted} to stay within the size limit"
+        await interaction.followup.send(message, ephemeral=True)
+
+    @app_commands.command(name="lemlang-stats")
+    @app_commands.default_permissions(administrator=True)
+    async def stats(self, interaction: discord.Interaction) -> None:
+        stats = self.outbound.stats
+        await interaction.response.send_message(
+            f"Messages reposted: {stats.messages}\n"
+            f"API calls: {stats.api_calls} "
+            f"({stats.calls_per_message:.2f} per message)\n"
+            f"Settings cache: {self.settings.stats.describe()}",
+            ephemeral=True,
+        )
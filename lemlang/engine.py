@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import random
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Container, Mapping
+
+# words, optionally joined by hyphens or apostrophes, e.g. "ice-cream", "don't"
+TOKEN = re.compile(r"\w+(?:[-']\w+)*")
+
+
+@dataclass(frozen=True)
+class Translation:
+    content: str
+    word: str | None = None
+    translation: str | None = None
+    # dictionary words that appeared in the content
+    used: frozenset[str] = frozenset()
+
+
+def translate(
+    content: str,
+    dictionary: Mapping[str, str],
+    vocabulary: Container[str],
+    new_translation: Callable[[str], str | None],
+    rng: random.Random | None = None,
+) -> Translation:
+    """Translate every known word in `content`, and add one new word.
+
+    The content is tokenized once. Known words are looked up as they are
+    seen, while vocabulary words without a translation are left as
+    placeholders. One of those is picked uniformly by reservoir sampling as
+    they are found, given a translation by `new_translation`, and the output
+    is joined once at the end.
+    """
+    randrange = random.randrange if rng is None else rng.randrange
+    parts: list[str] = []
+    pending: dict[str, list[int]] = {}
+    chosen: str | None = None
+    used: set[str] = set()
+    end = 0
+
+    for token in TOKEN.finditer(content):
+        parts.append(content[end : token.start()])
+        end = token.end()
+
+        word = token.group()
+        key = word.casefold()
+        if (translation := dictionary.get(key)) is not None:
+            parts.append(translation)
+            used.add(key)
+            continue
+
+        if key in vocabulary:
+            if key not in pending and randrange(len(pending) + 1) == 0:
+                chosen = key
+            pending.setdefault(key, []).append(len(parts))
+        parts.append(word)
+    parts.append(content[end:])
+
+    translation = None if chosen is None else new_translation(chosen)
+    if chosen is None or translation is None:
+        return Translation("".join(parts), used=frozenset(used))
+
+    for index in pending[chosen]:
+        parts[index] = translation
+    return Translation("".join(parts), chosen, translation, frozenset(used))
+
+
+def detranslate(content: str, reverse: Mapping[str, str]) -> str:
+    """Replace every translated word in `content` with its original word."""
+    return TOKEN.sub(
+        lambda token: reverse.get(token.group().casefold(), token.group()),
+        content,
+    )
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+
+import discord
+
+log = logging.getLogger("red.casper_cogs.lemlang")
+
+WEBHOOK_NAME = "Lemlang"
+ANNOUNCE_WINDOW = 5.0
+
+
+@dataclass
+class OutboundStats:
+    messages: int = 0
+    api_calls: int = 0
+
+    @property
+    def calls_per_message(self) -> float:
+        return self.api_calls / self.messages if self.messages else 0.0
+
+
+class Outbound:
+    """Sends everything the Lemlang channel posts.
+
+    Translated messages are reposted through a cached webhook that shows the
+    author's name and avatar, with the original deleted at the same time.
+    Nothing is reposted where the original cannot be deleted, and a repost
+    is taken down again if deleting the original fails.
+    Reposts in a channel keep their order. "New word" announcements are
+    collected for `window` seconds and then sent as a single message.
+    """
+
+    def __init__(self, bot: discord.Client, window: float = ANNOUNCE_WINDOW) -> None:
+        self.bot = bot
+        self.window = window
+        self.webhooks: dict[int, discord.Webhook | None] = {}
+        self.locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.announcements: dict[int, list[str]] = {}
+        self.channels: dict[int, discord.abc.MessageableChannel] = {}
+        self.flushers: dict[int, asyncio.Task] = {}
+        # channels where the bot cannot delete messages, warned about once
+        self.unmanaged: set[int] = set()
+        self.stats = OutboundStats()
+
+    async def repost(self, message: discord.Message, author: str, content: str) -> None:
+        channel = message.channel
+        # without deleting the original, every message would show up twice.
+        if not channel.permissions_for(channel.guild.me).manage_messages:
+            if channel.id not in self.unmanaged:
+                self.unmanaged.add(channel.id)
+                log.warning("Missing permission to delete messages in %s", channel)
+            return
+        self.unmanaged.discard(channel.id)
+
+        async with self.locks[channel.id]:
+            self.stats.messages += 1
+            webhook = await self._webhook(channel)
+
+            send = (
+                self._send_webhook(webhook, message, author, content)
+                if webhook is not None
+                else self._send_plain(channel, author, content)
+            )
+            self.stats.api_calls += 2
+            deleted, sent = await asyncio.gather(
+                message.delete(),
+                send,
+                return_exceptions=True,
+            )
+
+            if isinstance(deleted, discord.HTTPException):
+                # e.g. the author deleted it first, so take the repost down too.
+                log.warning("Failed to delete the original in %s: %s", channel, deleted)
+                if sent is not None and not isinstance(sent, BaseException):
+                    self.stats.api_calls += 1
+                    with contextlib.suppress(discord.HTTPException):
+                        await sent.delete()
+                return
+            for result in (deleted, sent):
+                if isinstance(result, BaseException):
+                    raise result
+
+    def announce(self, channel: discord.abc.MessageableChannel, text: str) -> None:
+        self.announcements.setdefault(channel.id, []).append(text)
+        self.channels[channel.id] = channel
+        if channel.id not in self.flushers:
+            self.flushers[channel.id] = asyncio.create_task(
+                self._flush_later(channel),
+            )
+
+    async def close(self) -> None:
+        """Send any announcements that are still waiting for their window."""
+        for task in self.flushers.values():
+            task.cancel()
+        await asyncio.gather(*self.flushers.values(), return_exceptions=True)
+        self.flushers.clear()
+
+        for channel in list(self.channels.values()):
+            await self._flush(channel)
+
+    async def _flush_later(self, channel: discord.abc.MessageableChannel) -> None:
+        await asyncio.sleep(self.window)
+        del self.flushers[channel.id]
+        await self._flush(channel)
+
+    async def _flush(self, channel: discord.abc.MessageableChannel) -> None:
+        self.channels.pop(channel.id, None)
+        lines = self.announcements.pop(channel.id, [])
+        if not lines:
+            return
+
+        self.stats.api_calls += 1
+        try:
+            await channel.send("\n".join(lines))
+        except discord.HTTPException as ex:
+            log.warning("Failed to send announcements in %s: %s", channel, ex)
+
+    async def _webhook(
+        self,
+        channel: discord.abc.MessageableChannel,
+    ) -> discord.Webhook | None:
+        if not isinstance(channel, discord.TextChannel):
+            return None
+
+        if channel.id in self.webhooks:
+            return self.webhooks[channel.id]
+
+        webhook = None
+        try:
+            self.stats.api_calls += 1
+            for existing in await channel.webhooks():
+                if (
+                    existing.name == WEBHOOK_NAME
+                    and existing.token is not None
+                    and existing.user == self.bot.user
+                ):
+                    webhook = existing
+                    break
+            else:
+                self.stats.api_calls += 1
+                webhook = await channel.create_webhook(name=WEBHOOK_NAME)
+        except discord.Forbidden:
+            log.info(
+                "Missing permission to manage webhooks in %s, "
+                "reposting as the bot instead",
+                channel,
+            )
+
+        self.webhooks[channel.id] = webhook
+        return webhook
+
+    async def _send_webhook(
+        self,
+        webhook: discord.Webhook,
+        message: discord.Message,
+        author: str,
+        content: str,
+    ) -> discord.Message:
+        try:
+            # wait for the sent message, so the repost can be undone.
+            return await webhook.send(
+                content,
+                username=author,
+                avatar_url=message.author.display_avatar.url,
+                wait=True,
+            )
+        except discord.HTTPException as ex:
+            log.warning("Webhook repost failed in %s: %s", message.channel, ex)
+            self.webhooks.pop(message.channel.id, None)
+            self.stats.api_calls += 1
+            return await self._send_plain(message.channel, author, content)
+
+    async def _send_plain(
+        self,
+        channel: discord.abc.MessageableChannel,
+        author: str,
+        content: str,
+    ) -> discord.Message:
+        return await channel.send(f"<{author}> {content}")
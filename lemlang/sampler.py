@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import random
+from typing import NotRequired, TypedDict
+
+
+class SamplerState(TypedDict):
+    vocabulary: str
+    seed: int
+    cursor: int
+    # translations freed by eviction, handed out again before new draws
+    recycled: NotRequired[list[str]]
+
+
+class Sampler:
+    """Draws from `range(size)` without replacement in constant time.
+
+    This is a Fisher-Yates shuffle run one step per draw. Only the swapped
+    positions are stored, so memory follows the number of draws rather than
+    `size`. Because the shuffle is driven by a seeded generator, the state
+    can be saved as just the seed and the number of draws made so far.
+    """
+
+    def __init__(
+        self,
+        vocabulary: str,
+        size: int,
+        seed: int | None = None,
+        cursor: int = 0,
+    ) -> None:
+        self.vocabulary = vocabulary
+        self.size = size
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.swaps: dict[int, int] = {}
+        self.cursor = 0
+
+        while self.cursor < min(cursor, size):
+            self.draw()
+
+    @classmethod
+    def from_state(cls, state: SamplerState, size: int) -> Sampler:
+        return cls(state["vocabulary"], size, state["seed"], state["cursor"])
+
+    def state(self) -> SamplerState:
+        return {
+            "vocabulary": self.vocabulary,
+            "seed": self.seed,
+            "cursor": self.cursor,
+        }
+
+    @property
+    def remaining(self) -> int:
+        return self.size - self.cursor
+
+    def draw(self) -> int | None:
+        """Return the next index, or None once every index has been drawn."""
+        if self.cursor >= self.size:
+            return None
+
+        pick = self.rng.randrange(self.cursor, self.size)
+        current = self.swaps.pop(self.cursor, self.cursor)
+        if pick == self.cursor:
+            value = current
+        else:
+            value = self.swaps.get(pick, pick)
+            self.swaps[pick] = current
+        self.cursor += 1
+        return value
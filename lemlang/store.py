@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from lemlang.sampler import Sampler, SamplerState
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import discord
+    from redbot.core import Config
+
+    from lemlang.vocabulary import Vocabulary
+
+log = logging.getLogger("red.casper_cogs.lemlang")
+
+FLUSH_INTERVAL = 30
+
+# positions in an entry's usage list
+CREATED, LAST_USED, USES = range(3)
+
+
+class Eviction(StrEnum):
+    LRU = "lru"
+    AGE = "age"
+
+
+class GuildDictionary:
+    """A guild's dictionary, held in memory with a record of unsaved changes.
+
+    Each entry is stored as `[translation, created, last_used, uses]`. When
+    `max_size` is set, adding a word past it evicts the least recently used
+    or the oldest word, depending on `eviction`. Callers should hold `lock`
+    while reading and updating it.
+    """
+
+    def __init__(
+        self,
+        entries: dict[str, str | list],
+        sampler: SamplerState | None = None,
+        *,
+        max_size: int | None = None,
+        eviction: Eviction = Eviction.LRU,
+    ) -> None:
+        self.entries: dict[str, str] = {}
+        self.usage: dict[str, list[int]] = {}
+        for word, value in entries.items():
+            # dictionaries saved before usage was tracked map straight to text.
+            translation, *usage = [value] if isinstance(value, str) else value
+            self.entries[word] = translation
+            self.usage[word] = [*usage, 0, 0, 0][:3]
+
+        # translation (casefolded) -> word, kept in step with entries.
+        self.reverse = {
+            translation.casefold(): word for word, translation in self.entries.items()
+        }
+        # words from least to most recently used.
+        self.recent = OrderedDict.fromkeys(self.entries)
+        self.sort_recent()
+        self.max_size = max_size
+        self.eviction = eviction
+
+        self.lock = asyncio.Lock()
+        # held for a whole flush, from taking the changes to writing them
+        self.flush_lock = asyncio.Lock()
+        self.dirty: set[str] = set()
+        self.deleted: set[str] = set()
+        self.cleared = False
+        self._sorted: list[str] | None = None
+        self.sampler_state = sampler
+        self.sampler: Sampler | None = None
+        self.sampler_dirty = False
+        self.recycled: list[str] = list((sampler or {}).get("recycled", []))
+
+    def add(self, word: str, translation: str, now: int | None = None) -> None:
+        self._insert(word, translation, int(time.time()) if now is None else now)
+        self.evict()
+
+    def _insert(self, word: str, translation: str, now: int) -> None:
+        # re-inserting keeps entries in order of creation for age eviction.
+        if (previous := self.entries.pop(word, None)) is not None:
+            self.reverse.pop(previous.casefold(), None)
+        elif self._sorted is not None:
+            bisect.insort(self._sorted, word)
+        self.entries[word] = translation
+        self.usage[word] = [now, now, 0]
+        self.recent[word] = None
+        self.recent.move_to_end(word)
+        self.reverse[translation.casefold()] = word
+        self.dirty.add(word)
+        self.deleted.discard(word)
+
+    def restore(
+        self,
+        word: str,
+        translation: str,
+        created: int,
+        last_used: int,
+        uses: int,
+    ) -> None:
+        """Add an entry with its usage, as read back from an export.
+
+        This does not evict. Call `sort_recent` and `evict` once the entries
+        are all restored. The alphabetical order is rebuilt on its next use,
+        rather than kept up to date for every entry of a large import.
+        """
+        self._sorted = None
+        self._insert(word, translation, created)
+        self.usage[word] = [created, last_used, uses]
+
+    def sort_recent(self) -> None:
+        self.recent = OrderedDict.fromkeys(
+            sorted(self.recent, key=lambda word: self.usage[word][LAST_USED]),
+        )
+
+    def touch(self, words: Iterable[str], now: int | None = None) -> None:
+        """Record a use of each of `words`.
+
+        The new usage goes out with the guild's next flush, in the same single
+        write as every other change, so busy words cost no extra writes.
+        """
+        now = int(time.time()) if now is None else now
+        for word in words:
+            if (usage := self.usage.get(word)) is None:
+                continue
+            usage[LAST_USED] = now
+            usage[USES] += 1
+            self.recent.move_to_end(word)
+            self.dirty.add(word)
+
+    def evict(self) -> list[str]:
+        """Remove words until the dictionary fits within `max_size`."""
+        if self.max_size is None or len(self.entries) <= self.max_size:
+            return []
+
+        # take every victim in one pass, as finding the first live key again
+        # after each removal is slow once many keys have been removed.
+        order = self.recent if self.eviction == Eviction.LRU else self.entries
+        evicted = list(itertools.islice(order, len(self.entries) - self.max_size))
+        for word in evicted:
+            self.remove(word)
+        return evicted
+
+    def remove(self, word: str) -> None:
+        translation = self.entries.pop(word)
+        del self.usage[word]
+        del self.recent[word]
+        self.reverse.pop(translation.casefold(), None)
+        self.recycled.append(translation)
+        self.sampler_dirty = True
+        if self._sorted is not None:
+            del self._sorted[bisect.bisect_left(self._sorted, word)]
+        self.dirty.discard(word)
+        self.deleted.add(word)
+
+    def reset(self) -> None:
+        self.entries.clear()
+        self.usage.clear()
+        self.recent.clear()
+        self.reverse.clear()
+        self._sorted = None
+        self.dirty.clear()
+        self.deleted.clear()
+        self.cleared = True
+        self.sampler_state = None
+        self.sampler = None
+        self.sampler_dirty = True
+        self.recycled.clear()
+
+    def record(self, word: str) -> list[str | int]:
+        """Return the compact form `word` is saved in."""
+        return [self.entries[word], *self.usage[word]]
+
+    def draw_translation(self, vocabulary: Vocabulary) -> str | None:
+        """Draw a word from `vocabulary` that is not yet used as a translation.
+
+        Translations freed by eviction are reused first. After that, words are
+        drawn without replacement, so a draw is only repeated for words that
+        were already translations before the sampler was used. Returns None
+        once the vocabulary is exhausted.
+        """
+        while self.recycled:
+            self.sampler_dirty = True
+            translation = self.recycled.pop()
+            if translation.casefold() not in self.reverse:
+                return translation
+
+        sampler = self._sampler(vocabulary)
+        while (index := sampler.draw()) is not None:
+            self.sampler_dirty = True
+            translation = vocabulary[index]
+            if translation.casefold() not in self.reverse:
+                return translation
+        return None
+
+    def saved_sampler(self) -> SamplerState | None:
+        """Return the sampler state to save, including recycled translations."""
+        state = self.sampler.state() if self.sampler else self.sampler_state
+        if state is None:
+            return None
+        return {**state, "recycled": list(self.recycled)}
+
+    def _sampler(self, vocabulary: Vocabulary) -> Sampler:
+        if self.sampler is not None and self.sampler.vocabulary == vocabulary.name:
+            return self.sampler
+
+        state = self.sampler_state
+        if state is not None and state["vocabulary"] == vocabulary.name:
+            self.sampler = Sampler.from_state(state, len(vocabulary))
+        else:
+            self.sampler = Sampler(vocabulary.name, len(vocabulary))
+            self.sampler_dirty = True
+        return self.sampler
+
+    def sorted_words(self) -> list[str]:
+        """All words in alphabetical order, sorted once and then kept in order."""
+        if self._sorted is None:
+            self._sorted = sorted(self.entries)
+        return self._sorted
+
+
+class DictionaryStore:
+    """Loads each guild's dictionary once and writes changes back in batches.
+
+    Changed entries are flushed to Config every `interval` seconds and when
+    the store is closed, in one write per guild no matter how many entries
+    changed.
+    """
+
+    def __init__(self, config: Config, interval: float = FLUSH_INTERVAL) -> None:
+        self.config = config
+        self.interval = interval
+        self.guilds: dict[int, GuildDictionary] = {}
+        self.load_lock = asyncio.Lock()
+        self.task: asyncio.Task | None = None
+
+    async def get(self, guild: discord.Guild) -> GuildDictionary:
+        if (dictionary := self.guilds.get(guild.id)) is not None:
+            return dictionary
+
+        async with self.load_lock:
+            if (dictionary := self.guilds.get(guild.id)) is None:
+                group = self.config.guild(guild)
+                dictionary = GuildDictionary(
+                    await group.dictionary(),
+                    await group.sampler(),
+                    max_size=await group.max_size(),
+                    eviction=Eviction(await group.eviction()),
+                )
+                self.guilds[guild.id] = dictionary
+        return dictionary
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self._flush_periodically())
+
+    async def close(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        for guild_id, dictionary in list(self.guilds.items()):
+            await self.flush_guild(guild_id, dictionary)
+
+    async def flush_guild(self, guild_id: int, dictionary: GuildDictionary) -> None:
+        # a reset's flush must not overlap a periodic one still writing the old
+        # dictionary, or that write would land last and undo the reset.
+        async with dictionary.flush_lock:
+            await self._flush_guild(guild_id, dictionary)
+
+    async def _flush_guild(self, guild_id: int, dictionary: GuildDictionary) -> None:
+        async with dictionary.lock:
+            if not (
+                dictionary.dirty
+                or dictionary.deleted
+                or dictionary.cleared
+                or dictionary.sampler_dirty
+            ):
+                return
+            changes = {word: dictionary.record(word) for word in dictionary.dirty}
+            deleted = set(dictionary.deleted)
+            cleared = dictionary.cleared
+            sampler = dictionary.sampler_dirty
+            dictionary.dirty.clear()
+            dictionary.deleted.clear()
+            dictionary.cleared = False
+            dictionary.sampler_dirty = False
+            state = dictionary.saved_sampler()
+
+        group = self.config.guild_from_id(guild_id)
+        saved = False
+        try:
+            # Red rewrites the whole data file on every write, so each guild's
+            # changes go out in one write rather than one per word.
+            if cleared:
+                await group.dictionary.set(changes)
+            else:
+                async with group.dictionary() as entries:
+                    entries.update(changes)
+                    for word in deleted:
+                        entries.pop(word, None)
+            if sampler:
+                await group.sampler.set(state)
+            saved = True
+        except Exception:
+            log.exception("Failed to save dictionary for guild %s", guild_id)
+        finally:
+            # this also runs when close() cancels a flush part way through, so
+            # the final flush still has the changes to write.
+            if not saved:
+                dictionary.dirty.update(
+                    word for word in changes if word in dictionary.entries
+                )
+                dictionary.deleted.update(
+                    word for word in deleted if word not in dictionary.entries
+                )
+                dictionary.cleared = dictionary.cleared or cleared
+                dictionary.sampler_dirty = dictionary.sampler_dirty or sampler
+
+        if saved:
+            log.debug(
+                "Saved %d dictionary entries for guild %s",
+                len(changes),
+                guild_id,
+            )
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
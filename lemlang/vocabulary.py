@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import mmap
+import random
+from array import array
+from pathlib import Path
+
+data_path = Path(__file__).parent.resolve() / "data"
+
+DEFAULT_VOCABULARY = "oxford3k"
+
+
+class UnknownVocabularyError(Exception):
+    def __init__(self, name: str) -> None:
+        super().__init__(f"There is no vocabulary called {name}")
+
+
+class Vocabulary:
+    """An immutable word list, shared by every guild that uses it.
+
+    Membership is checked against a frozenset of casefolded words. Words for
+    random choice are kept as one UTF-8 blob with an array of offsets, rather
+    than a list of separate string objects.
+    """
+
+    def __init__(self, name: str, blob: bytes, offsets: array[int]) -> None:
+        self.name = name
+        self.blob = blob
+        self.offsets = offsets
+        self.index = frozenset(self[i].casefold() for i in range(len(self)))
+
+    @classmethod
+    def from_file(cls, path: Path) -> Vocabulary:
+        """Read a word list with one word or phrase per line.
+
+        The file is memory-mapped and read a line at a time, and phrases have
+        their spaces replaced with hyphens.
+        """
+        blob = bytearray()
+        offsets = array("I", [0])
+
+        if path.stat().st_size == 0:
+            return cls(path.stem, bytes(blob), offsets)
+
+        with path.open("rb") as file, mmap.mmap(
+            file.fileno(),
+            0,
+            access=mmap.ACCESS_READ,
+        ) as mapped:
+            for line in iter(mapped.readline, b""):
+                word = line.removeprefix(b"\xef\xbb\xbf").strip().replace(b" ", b"-")
+                if word:
+                    blob += word
+                    offsets.append(len(blob))
+
+        return cls(path.stem, bytes(blob), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.blob[self.offsets[index] : self.offsets[index + 1]].decode()
+
+    def __contains__(self, word: object) -> bool:
+        return word in self.index
+
+    def choice(self, rng: random.Random | None = None) -> str:
+        return self[(rng or random).randrange(len(self))]
+
+
+def available() -> list[str]:
+    """Names of the vocabularies in the data folder."""
+    return sorted(path.stem for path in data_path.glob("*.txt"))
+
+
+_loaded: dict[str, Vocabulary] = {}
+
+
+def loaded(name: str) -> Vocabulary | None:
+    """Return the named vocabulary if it has already been loaded."""
+    return _loaded.get(name)
+
+
+def load(name: str = DEFAULT_VOCABULARY) -> Vocabulary:
+    """Load a vocabulary by name. Each one is only read once per process."""
+    if (words := _loaded.get(name)) is not None:
+        return words
+
+    if name not in available():
+        raise UnknownVocabularyError(name)
+
+    words = Vocabulary.from_file(data_path / f"{name}.txt")
+    return _loaded.setdefault(name, words)
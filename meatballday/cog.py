@@ -1,16 +1,42 @@
 from __future__ import annotations
 
 import asyncio
-import itertools
+import calendar
+import contextlib
+import csv
+import io
 import logging
-from typing import Protocol
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Protocol
 
 import discord
 import pendulum
 from redbot.core import Config, app_commands, commands
 
-CHECK_TIME = pendulum.time(hour=9, minute=0)
+from meatballday.index import CalendarIndex
+from meatballday.progress import CheckProgress
+from meatballday.scheduler import DEFAULT_CHECK_TIME, CheckScheduler, GuildSchedule
+from meatballday.settings import MISSING, GuildSetting, GuildSettings
+from meatballday.transfer import DateFormat, read_rows, write_rows
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from redbot.core.config import Group
+
 MAX_SLEEP = pendulum.duration(hours=3)
+MAX_NEXT = 10
+# rejected import rows listed in the reply; the rest are attached as a file
+MAX_REJECTS_SHOWN = 10
+# longer rejects are cut short in the reply, to stay within Discord's limit
+MAX_REJECT_LENGTH = 150
+EXPORT_SPOOL_SIZE = 1024 * 1024
+# guilds updated at once; each guild's own API calls are made one at a time
+GUILD_CONCURRENCY = 8
+PROGRESS_INTERVAL = 5
+# the timezones pendulum can load, which differ from the system's tz database
+TIMEZONES = sorted(pendulum.timezones)
 
 MONTH_NAMES = [
     "January",
@@ -28,6 +54,21 @@ MONTH_NAMES = [
 ]
 
 
+def next_occurrence(today: pendulum.Date, month: int, day: int) -> pendulum.Date | None:
+    """Return the first date after today falling on the given month and day.
+
+    February 29th only falls in leap years, and a date that never exists,
+    such as February 31st, returns None.
+    """
+    first = today.year if (month, day) > (today.month, today.day) else today.year + 1
+    for year in range(first, first + 8):
+        try:
+            return pendulum.date(year, month, day)
+        except ValueError:
+            continue
+    return None
+
+
 def to_ordinal(n: int) -> str:
     if 11 <= n <= 13:  # noqa: PLR2004
         return f"{n}th"
@@ -82,6 +123,103 @@ def get_day(value: str) -> int:
     return day
 
 
+def get_date(month_value: str, day_value: str) -> tuple[int, int]:
+    """Validate a month and day that exist in some year, counting February 29th."""
+    month = get_month(month_value)
+    day = get_day(day_value)
+
+    # 2000 was a leap year
+    days_in_month = calendar.monthrange(2000, month)[1]
+    if day > days_in_month:
+        raise OutOfRangeError(day, 1, days_in_month)
+
+    return month, day
+
+
+class MissingFieldError(ValidationError):
+    def __init__(self, field: str) -> None:
+        super().__init__(f"{field} is missing")
+
+
+def get_member_date(row: object) -> tuple[int, int, int]:
+    """Validate an imported `{"member_id", "month", "day"}` row."""
+    if not isinstance(row, dict):
+        msg = "Row is not an object with member_id, month and day"
+        raise ValidationError(msg)
+
+    for field in ("member_id", "month", "day"):
+        if row.get(field) in (None, ""):
+            raise MissingFieldError(field)
+
+    member_id = str(row["member_id"]).strip()
+    # isdecimal, as isdigit also accepts superscript digits that int rejects.
+    if not member_id.isdecimal():
+        raise NotNumericError(member_id)
+    try:
+        snowflake = int(member_id)
+    except ValueError as ex:
+        # too many digits to convert
+        raise NotNumericError(member_id) from ex
+
+    month, day = get_date(str(row["month"]), str(row["day"]))
+    return snowflake, month, day
+
+
+def get_member_dates(
+    rows: Iterator[tuple[int, Any]],
+    guild: discord.Guild,
+) -> tuple[dict[int, tuple[int, int]], list[str]]:
+    """Validate imported rows, returning the dates to set and the rejected lines."""
+    dates: dict[int, tuple[int, int]] = {}
+    rejects: list[str] = []
+    try:
+        for line, row in rows:
+            try:
+                member_id, month, day = get_member_date(row)
+            except ValidationError as ex:
+                rejects.append(f"line {line}: {ex}")
+                continue
+
+            if guild.get_member(member_id) is None:
+                rejects.append(f"line {line}: {member_id} is not a member here")
+                continue
+            dates[member_id] = (month, day)
+    except UnicodeDecodeError:
+        rejects.append("the rest of the file is not UTF-8 text")
+    except csv.Error as ex:
+        rejects.append(f"the rest of the file could not be read: {ex}")
+    return dates, rejects
+
+
+class InvalidTimeError(ValidationError):
+    def __init__(self, value: str) -> None:
+        super().__init__(f"{value} is not a time in HH:MM format")
+
+
+class UnknownTimezoneError(ValidationError):
+    def __init__(self, value: str) -> None:
+        super().__init__(f"{value} is not a timezone I know")
+
+
+def get_check_time(value: str) -> str:
+    hour, sep, minute = value.strip().partition(":")
+    if not sep or not hour.isdecimal() or not minute.isdecimal():
+        raise InvalidTimeError(value)
+
+    if int(hour) not in range(24):
+        raise OutOfRangeError(int(hour), 0, 23)
+    if int(minute) not in range(60):
+        raise OutOfRangeError(int(minute), 0, 59)
+
+    return f"{int(hour):02}:{int(minute):02}"
+
+
+def get_timezone(value: str) -> str:
+    if value not in pendulum.timezones:
+        raise UnknownTimezoneError(value)
+    return value
+
+
 class MeatballSetCallback(Protocol):
     async def __call__(
         self,
@@ -113,8 +251,7 @@ class MeatballSetModal(discord.ui.Modal):
         super().__init__(title="Meatball Day")
 
     async def on_submit(self, interaction: discord.Interaction) -> None:
-        month = get_month(self.month.value)
-        day = get_day(self.day.value)
+        month, day = get_date(self.month.value, self.day.value)
         await self.callback(month, day, interaction=interaction)
 
 
@@ -128,8 +265,15 @@ def ensure_member(interaction: discord.Interaction) -> discord.Member:
 
 
 class MeatballDay(commands.Cog):
-    def __init__(self, bot: commands.Bot) -> None:
+    def __init__(
+        self,
+        bot: commands.Bot,
+        *,
+        clock: Callable[[], pendulum.DateTime] = pendulum.now,
+    ) -> None:
         self.bot = bot
+        # the current time, replaced to simulate days passing
+        self.clock = clock
 
         self.config = Config.get_conf(
             self,
@@ -140,31 +284,56 @@ class MeatballDay(commands.Cog):
         self.config.register_guild(
             channel=None,
             role=None,
+            timezone=None,
+            check_time=DEFAULT_CHECK_TIME,
+            # superseded by the global last_checks, read until a guild's next check
+            last_check=None,
         )
 
+        # guild ID -> the guild's local date of its last check, as an ISO date.
+        # these are kept together so each batch of checks is saved in one write.
+        self.config.register_global(last_checks={})
+
         self.config.register_member(
             month=None,
             day=None,
         )
 
         self.task: asyncio.Task | None = None
-        self.next_check: pendulum.DateTime | None = None
-
-    def _set_next_check(self) -> None:
-        self.next_check = pendulum.tomorrow().at(
-            hour=CHECK_TIME.hour,
-            minute=CHECK_TIME.minute,
-        )
+        self.calendar = CalendarIndex()
+        self.scheduler = CheckScheduler()
+        # checks run one at a time, so a guild is never updated twice at once
+        self.update_lock = asyncio.Lock()
+        self.update_task: asyncio.Task | None = None
+        self.progress: CheckProgress | None = None
+        self.reporters: set[asyncio.Task] = set()
+
+        self.settings = GuildSettings(self.config)
+        self.channel: GuildSetting[int | None] = self.settings.add("channel")
+        self.role: GuildSetting[int | None] = self.settings.add("role")
 
     async def cog_load(self) -> None:
-        self._set_next_check()
+        self.calendar = CalendarIndex.from_config(await self.config.all_members())
+
+        now = self.clock()
+        last_checks = await self.config.last_checks()
+        for guild_id, settings in (await self.config.all_guilds()).items():
+            if settings["role"] is not None:
+                last_check = last_checks.get(str(guild_id), settings["last_check"])
+                self.scheduler.schedule(
+                    guild_id,
+                    self._guild_schedule(guild_id, settings, last_check),
+                    now,
+                )
+
         self.task = asyncio.create_task(self._check_meatball_day())
 
     async def cog_unload(self) -> None:
         if self.task is not None:
             self.task.cancel()
             self.task = None
-            self.next_check = None
+        if self.update_task is not None:
+            self.update_task.cancel()
 
     @app_commands.command(name="meatball-get")
     @app_commands.guild_only()
@@ -196,8 +365,8 @@ class MeatballDay(commands.Cog):
             interaction: discord.Interaction,
         ) -> None:
             member = ensure_member(interaction)
-            await self.config.member(member).month.set(month)
-            await self.config.member(member).day.set(day)
+            await self.config.member(member).set({"month": month, "day": day})
+            self.calendar.set(member.guild.id, member.id, month, day)
             await interaction.response.send_message(
                 "I have set your Meatball Day to "
                 f"{MONTH_NAMES[month-1]} {to_ordinal(day)}! :calendar:",
@@ -214,21 +383,49 @@ class MeatballDay(commands.Cog):
     async def meatball_forget(self, interaction: discord.Interaction) -> None:
         member = ensure_member(interaction)
         await self.config.member(member).clear()
+        self.calendar.remove(member.guild.id, member.id)
         await interaction.response.send_message(
             "Your Meatball Day has been lost, like tears in rain. :magic_wand:",
             ephemeral=True,
         )
 
     @app_commands.command(name="meatball-next")
-    @app_commands.checks.cooldown(rate=1, per=3600)
+    @app_commands.describe(count="How many upcoming Meatball Days to show")
     @app_commands.guild_only()
-    async def meatball_next(self, interaction: discord.Interaction) -> None:
+    async def meatball_next(
+        self,
+        interaction: discord.Interaction,
+        count: app_commands.Range[int, 1, MAX_NEXT] = 1,
+    ) -> None:
         if interaction.guild is None:
             msg = "Interaction guild is None, use @guild_only"
             raise RuntimeError(msg)
 
-        all_members = await self.config.all_members(interaction.guild)
-        if not all_members:
+        schedule = self.scheduler.guilds.get(interaction.guild.id) or GuildSchedule()
+        today = schedule.today(self.clock())
+        year_ahead = today.add(years=1)
+        upcoming: list[tuple[discord.Member, pendulum.Date]] = []
+        # february 29th comes later than its place in the calendar outside of
+        # leap years, so those are held back and merged in by their real date.
+        deferred: list[tuple[discord.Member, pendulum.Date]] = []
+        for month, day, member_id in self.calendar.after(
+            interaction.guild.id,
+            today.month,
+            today.day,
+        ):
+            member = interaction.guild.get_member(member_id)
+            date = next_occurrence(today, month, day)
+            if member is None or date is None:
+                continue
+            if date > year_ahead:
+                deferred.append((member, date))
+                continue
+            upcoming.append((member, date))
+            if len(upcoming) == count:
+                break
+        upcoming = sorted(upcoming + deferred, key=lambda entry: entry[1])[:count]
+
+        if not upcoming:
             await interaction.response.send_message(
                 "Nobody has set their Meatball Day yet. "
                 "You could be the first! Use `/meatball set` to get started.",
@@ -236,27 +433,21 @@ class MeatballDay(commands.Cog):
             )
             return
 
-        years = [pendulum.today().year, pendulum.today().add(years=1).year]
-
-        configs = []
-        for member, config in all_members.items():
-            if member := interaction.guild.get_member(member):
-                configs.append((member, config["month"], config["day"]))
-
-        all_member_dates = sorted(
-            (
-                (member, pendulum.date(year=year, month=month, day=day))
-                for year, (member, month, day) in itertools.product(years, configs)
-            ),
-            key=lambda pair: pair[1],
-        )
-        member, date = next(
-            (member, date) for member, date in all_member_dates if date.is_future()
-        )
+        if count == 1:
+            member, date = upcoming[0]
+            await interaction.response.send_message(
+                f"Next Meatball Day is for {member.mention} "
+                f"on {date.to_formatted_date_string()}! :eyes:",
+            )
+            return
 
+        lines = [
+            f"{date.to_formatted_date_string()}: {member.mention}"
+            for member, date in upcoming
+        ]
         await interaction.response.send_message(
-            f"Next Meatball Day is for {member.mention} "
-            f"on {date.to_formatted_date_string()}! :eyes:",
+            "Upcoming Meatball Days: :eyes:\n" + "\n".join(lines),
+            allowed_mentions=discord.AllowedMentions.none(),
         )
 
     @app_commands.command(name="meatball-role")
@@ -272,11 +463,69 @@ class MeatballDay(commands.Cog):
             msg = "Interaction guild is None, use @guild_only"
             raise RuntimeError(msg)
 
-        await self.config.guild(interaction.guild).role.set(role.id)
+        await self.role.set(interaction.guild, role.id)
+        await self._schedule(interaction.guild.id)
         await interaction.response.send_message(
             f"I have set the Meatball Day role to {role.mention}.",
         )
 
+    @app_commands.command(name="meatball-schedule")
+    @app_commands.describe(
+        timezone="The server's timezone, such as Europe/London",
+        check_time="The local time to update Meatball Day roles, as HH:MM",
+    )
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def meatball_schedule(
+        self,
+        interaction: discord.Interaction,
+        timezone: str | None = None,
+        check_time: str | None = None,
+    ) -> None:
+        if interaction.guild is None:
+            msg = "Interaction guild is None, use @guild_only"
+            raise RuntimeError(msg)
+
+        try:
+            timezone = get_timezone(timezone) if timezone is not None else None
+            check_time = get_check_time(check_time) if check_time is not None else None
+        except ValidationError as ex:
+            await interaction.response.send_message(
+                f"{ex}. Please try again.",
+                ephemeral=True,
+            )
+            return
+
+        group = self.config.guild(interaction.guild)
+        if timezone is not None:
+            await group.timezone.set(timezone)
+        if check_time is not None:
+            await group.check_time.set(check_time)
+
+        settings = await group.all()
+        when = await self._schedule(interaction.guild.id, settings)
+        zone = settings["timezone"] or "the bot's local time"
+        message = (
+            f"Meatball Days are checked at {settings['check_time']} in {zone}."
+        )
+        if when is None:
+            message += " Set a role with `/meatball-role` to start checking."
+        else:
+            message += f" The next check is {when.diff_for_humans()}."
+        await interaction.response.send_message(message)
+
+    @meatball_schedule.autocomplete("timezone")
+    async def timezone_autocomplete(
+        self,
+        _: discord.Interaction,
+        current: str,
+    ) -> list[app_commands.Choice[str]]:
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in TIMEZONES
+            if current.casefold() in name.casefold()
+        ][:25]
+
     @app_commands.command(name="meatball-channel")
     @app_commands.describe(channel="The channel to post in on Meatball Day")
     @app_commands.default_permissions(administrator=True)
@@ -290,7 +539,7 @@ class MeatballDay(commands.Cog):
             msg = "Interaction guild is None, use @guild_only"
             raise RuntimeError(msg)
 
-        await self.config.guild(interaction.guild).channel.set(channel.id)
+        await self.channel.set(interaction.guild, channel.id)
         await interaction.response.send_message(
             f"I have set the Meatball Day channel to {channel.mention}.",
         )
@@ -298,10 +547,25 @@ class MeatballDay(commands.Cog):
     @app_commands.command(name="meatball-recheck")
     @app_commands.default_permissions(administrator=True)
     async def meatball_recheck(self, interaction: discord.Interaction) -> None:
-        await self._update_meatball_roles()
-        await interaction.response.send_message(
-            "I have rechecked all members for Meatball Day.",
+        task, progress = self._start_update()
+        await interaction.response.send_message(progress.describe())
+
+        reporter = asyncio.create_task(
+            self._report_progress(interaction, task, progress),
         )
+        self.reporters.add(reporter)
+        reporter.add_done_callback(self.reporters.discard)
+
+    async def _report_progress(
+        self,
+        interaction: discord.Interaction,
+        task: asyncio.Task,
+        progress: CheckProgress,
+    ) -> None:
+        while not task.done():
+            await asyncio.wait({task}, timeout=PROGRESS_INTERVAL)
+            with contextlib.suppress(discord.HTTPException):
+                await interaction.edit_original_response(content=progress.describe())
 
     @app_commands.command(name="meatball-set-member")
     @app_commands.describe(member="The member to set the Meatball Day for")
@@ -318,8 +582,8 @@ class MeatballDay(commands.Cog):
             *,
             interaction: discord.Interaction,
         ) -> None:
-            await self.config.member(member).month.set(month)
-            await self.config.member(member).day.set(day)
+            await self.config.member(member).set({"month": month, "day": day})
+            self.calendar.set(member.guild.id, member.id, month, day)
             await interaction.response.send_message(
                 f"I have set {member.mention}'s Meatball Day to "
                 f"{MONTH_NAMES[month-1]} {to_ordinal(day)}.",
@@ -333,105 +597,423 @@ class MeatballDay(commands.Cog):
                 ephemeral=True,
             )
 
+    @staticmethod
+    def _guild_schedule(
+        guild_id: int,
+        settings: dict,
+        last_check: str | None,
+    ) -> GuildSchedule:
+        timezone = settings["timezone"]
+        # names saved before they were checked against pendulum may not load.
+        if timezone is not None and timezone not in pendulum.timezones:
+            log.warning(
+                "Unknown timezone %s in guild %s, using local time.",
+                timezone,
+                guild_id,
+            )
+            timezone = None
+        return GuildSchedule(
+            timezone=timezone,
+            check_time=settings["check_time"],
+            last_check=last_check,
+        )
+
+    async def _schedule(
+        self,
+        guild_id: int,
+        settings: dict | None = None,
+    ) -> pendulum.DateTime | None:
+        """Schedule a guild's daily check from its config, if it has a role."""
+        if settings is None:
+            settings = await self.config.guild_from_id(guild_id).all()
+        if settings["role"] is None:
+            self.scheduler.remove(guild_id)
+            return None
+        last_check = await self.config.last_checks.get_raw(
+            str(guild_id),
+            default=settings["last_check"],
+        )
+        return self.scheduler.schedule(
+            guild_id,
+            self._guild_schedule(guild_id, settings, last_check),
+            self.clock(),
+        )
+
+    @app_commands.command(name="meatball-import")
+    @app_commands.describe(
+        file="A CSV with member_id, month and day columns, or JSON lines of the same",
+    )
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def meatball_import(
+        self,
+        interaction: discord.Interaction,
+        file: discord.Attachment,
+    ) -> None:
+        if interaction.guild is None:
+            msg = "Interaction guild is None, use @guild_only"
+            raise RuntimeError(msg)
+
+        guild = interaction.guild
+        await interaction.response.defer(ephemeral=True)
+
+        with tempfile.TemporaryFile() as saved:
+            await file.save(saved)
+            saved.seek(0)
+            rows = read_rows(saved, DateFormat.from_filename(file.filename))
+            dates, rejects = get_member_dates(rows, guild)
+
+        if dates:
+            async with self._members_group(guild.id).all() as members:
+                for member_id, (month, day) in dates.items():
+                    members.setdefault(str(member_id), {}).update(month=month, day=day)
+            for member_id, (month, day) in dates.items():
+                self.calendar.set(guild.id, member_id, month, day)
+
+        message = f"Imported {len(dates)} Meatball Days, rejected {len(rejects)} rows."
+        shown = [
+            reject
+            if len(reject) <= MAX_REJECT_LENGTH
+            else reject[: MAX_REJECT_LENGTH - 3] + "..."
+            for reject in rejects[:MAX_REJECTS_SHOWN]
+        ]
+        if shown:
+            message += "\n" + "\n".join(shown)
+        if shown != rejects:
+            report = discord.File(
+                io.BytesIO("\n".join(rejects).encode()),
+                filename="rejected.txt",
+            )
+            await interaction.followup.send(message, file=report, ephemeral=True)
+        else:
+            await interaction.followup.send(message, ephemeral=True)
+
+    @app_commands.command(name="meatball-export")
+    @app_commands.describe(format="The file format to export")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def meatball_export(
+        self,
+        interaction: discord.Interaction,
+        format: DateFormat = DateFormat.CSV,  # noqa: A002
+    ) -> None:
+        if interaction.guild is None:
+            msg = "Interaction guild is None, use @guild_only"
+            raise RuntimeError(msg)
+
+        members = self.calendar.members(interaction.guild.id)
+        rows = ((member_id, *date) for member_id, date in members.items())
+        extension = "csv" if format == DateFormat.CSV else "jsonl"
+        with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE) as file:
+            count = write_rows(file, format, rows)
+            file.seek(0)
+            await interaction.response.send_message(
+                f"Exported {count} Meatball Days.",
+                file=discord.File(file, filename=f"meatball-days.{extension}"),
+                ephemeral=True,
+            )
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        if self.calendar.get(member.guild.id, member.id) is None:
+            return
+        await self.config.member(member).clear()
+        self.calendar.remove(member.guild.id, member.id)
+        log.debug("Forgot Meatball Day of %s, who left %s", member, member.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        await self.config.guild(guild).clear()
+        await self.config.clear_all_members(guild)
+        await self.config.last_checks.clear_raw(str(guild.id))
+        self.settings.invalidate(guild.id)
+        self.calendar.remove_guild(guild.id)
+        self.scheduler.remove(guild.id)
+        log.info("Removed Meatball Day config for %s", guild)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        if await self.role.get(role.guild) != role.id:
+            return
+        await self.role.clear(role.guild)
+        self.scheduler.remove(role.guild.id)
+        log.info("Meatball Day role %s was deleted in %s", role, role.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        if await self.channel.get(channel.guild) != channel.id:
+            return
+        await self.channel.clear(channel.guild)
+        log.info("Meatball Day channel %s was deleted in %s", channel, channel.guild)
+
+    @app_commands.command(name="meatball-prune")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def meatball_prune(self, interaction: discord.Interaction) -> None:
+        """Remove Meatball Days of members who have left, and deleted settings."""
+        if interaction.guild is None:
+            msg = "Interaction guild is None, use @guild_only"
+            raise RuntimeError(msg)
+
+        await interaction.response.defer(ephemeral=True)
+        members = await self._prune_guild(interaction.guild)
+        message = f"Removed {members} Meatball Days of members who have left."
+
+        # guilds the bot has left can only be seen and pruned by its owner.
+        if await self.bot.is_owner(interaction.user):
+            guilds = await self._prune_departed_guilds()
+            message += f" Removed the config of {guilds} guilds I have left."
+        await interaction.followup.send(message, ephemeral=True)
+
+    async def _prune_guild(self, guild: discord.Guild) -> int:
+        """Clear a guild's stale settings and absent members, in one write per guild."""
+        if guild.get_channel(await self.channel.get(guild)) is None:
+            await self.channel.clear(guild)
+        if guild.get_role(await self.role.get(guild)) is None:
+            await self.role.clear(guild)
+            self.scheduler.remove(guild.id)
+
+        departed = [
+            member_id
+            for member_id in self.calendar.members(guild.id)
+            if guild.get_member(member_id) is None
+        ]
+        if departed:
+            async with self._members_group(guild.id).all() as members:
+                for member_id in departed:
+                    members.pop(str(member_id), None)
+            for member_id in departed:
+                self.calendar.remove(guild.id, member_id)
+        return len(departed)
+
+    async def _prune_departed_guilds(self) -> int:
+        departed = {
+            guild_id
+            for guild_id in (
+                *(await self.config.all_guilds()),
+                *(await self.config.all_members()),
+                *map(int, await self.config.last_checks()),
+            )
+            if self.bot.get_guild(guild_id) is None
+        }
+        if departed:
+            async with self.config.last_checks() as last_checks:
+                for guild_id in departed:
+                    last_checks.pop(str(guild_id), None)
+        for guild_id in departed:
+            await self.config.guild_from_id(guild_id).clear()
+            await self.config.clear_all_members(discord.Object(id=guild_id))
+            self.settings.invalidate(guild_id)
+            self.calendar.remove_guild(guild_id)
+            self.scheduler.remove(guild_id)
+        return len(departed)
+
+    def _members_group(self, guild_id: int) -> Group:
+        # Config has no public way to write many members of a guild at once,
+        # and a write per member would rewrite the whole data file each time.
+        # Red reads this same group for all_members(guild). Its warning is
+        # about writing data of the wrong shape, so callers only write back
+        # what they read, with month and day set or whole members removed.
+        return self.config._get_base_group(Config.MEMBER, str(guild_id))  # noqa: SLF001
+
     async def _check_meatball_day(self) -> None:
+        """Run each guild's check when it is due.
+
+        Guilds are kept in a heap by their next check time, and the loop
+        sleeps until the earliest one, waking early if a guild's schedule
+        changes. After downtime, guilds that missed a check are due straight
+        away and are checked once.
+        """
         if not self.bot.is_ready():
             log.debug("Waiting for bot to be ready")
             await self.bot.wait_until_ready()
 
         log.debug("Bot is ready, entering check loop")
         while True:
-            if self.next_check is None:
-                msg = "next_check is None"
-                raise RuntimeError(msg)
-
-            until_check = min(self.next_check - pendulum.now(), MAX_SLEEP)
-            if until_check.in_seconds() > 0:
-                log.info(
-                    "Next check is at %s; sleeping for %s",
-                    self.next_check,
-                    until_check.in_words(),
+            self.scheduler.changed.clear()
+            await self._run_due_checks()
+
+            sleep = MAX_SLEEP.in_seconds()
+            if (next_due := self.scheduler.next_due()) is not None:
+                sleep = min(next_due - self.clock().timestamp(), sleep)
+                log.debug(
+                    "Next check is at %s; sleeping for %.0fs",
+                    pendulum.from_timestamp(next_due),
+                    sleep,
                 )
-                await asyncio.sleep(until_check.in_seconds())
-            else:
-                log.info("Check time has elapsed, checking for meatball days now")
-
-            await self._update_meatball_roles()
-
-            self._set_next_check()
-            await asyncio.sleep(1)
-
-    async def _update_meatball_roles(self) -> None:
-        all_meatball_days = await self.config.all_members()
-        for guild_id, members in all_meatball_days.items():
-            guild = self.bot.get_guild(guild_id)
-            if guild is None:
-                log.warning(
-                    "Guild %s no longer exists, removing from config.",
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self.scheduler.changed.wait(), max(sleep, 0))
+
+    async def _run_due_checks(self) -> None:
+        """Check every guild that is due now, and schedule their next checks."""
+        now = self.clock()
+        due = self.scheduler.pop_due(now)
+        if not due:
+            return
+
+        log.info("Checking %d guilds for Meatball Days", len(due))
+        await self._update_meatball_roles(guild_ids=due)
+        checked = {
+            str(guild_id): last_check
+            for guild_id in due
+            if (last_check := self.scheduler.checked(guild_id, now)) is not None
+        }
+        if checked:
+            async with self.config.last_checks() as last_checks:
+                last_checks.update(checked)
+
+    def _start_update(self) -> tuple[asyncio.Task, CheckProgress]:
+        """Start a check of every scheduled guild, or join the one already running."""
+        if self.update_task is None or self.progress is None:
+            self.progress = CheckProgress()
+            self.update_task = asyncio.create_task(
+                self._update_meatball_roles(self.progress),
+            )
+            self.update_task.add_done_callback(self._update_finished)
+        return self.update_task, self.progress
+
+    def _update_finished(self, task: asyncio.Task) -> None:
+        if self.update_task is task:
+            self.update_task = None
+
+    async def _update_meatball_roles(
+        self,
+        progress: CheckProgress | None = None,
+        guild_ids: Iterable[int] | None = None,
+    ) -> None:
+        """Update Meatball Day roles in the given guilds, or every scheduled guild.
+
+        Each guild's celebrants are found for its own local date. Guilds are
+        updated concurrently, up to GUILD_CONCURRENCY at a time, so a slow
+        guild does not hold up the rest. An error in one guild is logged and
+        counted without stopping the others.
+        """
+        progress = progress or CheckProgress()
+        async with self.update_lock:
+            progress.started = time.perf_counter()
+            await self._update_guilds(
+                progress,
+                list(self.scheduler.guilds) if guild_ids is None else guild_ids,
+            )
+
+    async def _update_guilds(
+        self,
+        progress: CheckProgress,
+        guild_ids: Iterable[int],
+    ) -> None:
+        now = self.clock()
+        celebrants: dict[int, list[int]] = {}
+        for guild_id in guild_ids:
+            schedule = self.scheduler.guilds.get(guild_id) or GuildSchedule()
+            today = schedule.today(now)
+            celebrants[guild_id] = list(
+                self.calendar.on(guild_id, today.month, today.day),
+            )
+
+        progress.guilds = len(celebrants)
+        semaphore = asyncio.Semaphore(GUILD_CONCURRENCY)
+
+        async def update(guild_id: int, member_ids: list[int]) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                failed = False
+                try:
+                    await self._update_guild(guild_id, member_ids, progress)
+                except Exception:
+                    failed = True
+                    log.exception(
+                        "Failed to update Meatball Day roles in guild %s",
+                        guild_id,
+                    )
+                progress.guild_finished(
                     guild_id,
+                    time.perf_counter() - started,
+                    failed=failed,
                 )
-                await self.config.guild_from_id(guild_id).clear()
-                continue
 
-            channel_id = await self.config.guild(guild).channel()
-            channel = guild.get_channel(channel_id)
-            if channel is None:
-                log.warning(
-                    "Channel %s does not exist in guild %s, skipping.",
-                    channel_id,
-                    guild,
-                )
-                continue
+        await asyncio.gather(
+            *(
+                update(guild_id, member_ids)
+                for guild_id, member_ids in celebrants.items()
+            ),
+        )
+        progress.finish()
+        log.info("Meatball Day check: %s", progress.describe())
 
-            if not isinstance(channel, discord.TextChannel):
-                log.warning(
-                    "Channel %s in guild %s is not a text channel, skipping.",
-                    channel,
-                    guild,
-                )
-                continue
+    async def _update_guild(
+        self,
+        guild_id: int,
+        celebrants: list[int],
+        progress: CheckProgress,
+    ) -> None:
+        """Give the role to exactly the guild's celebrants.
+
+        The celebrants are compared with the role's current holders, so the
+        only API calls made are for members gaining or losing the role.
+        """
+        # departures are cleaned up by the listeners and /meatball-prune, so a
+        # guild or member missing here may just be unavailable for now.
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            log.warning("Guild %s is not available, skipping.", guild_id)
+            return
 
-            role_id = await self.config.guild(guild).role()
-            role = guild.get_role(role_id)
-            if role is None:
-                log.warning(
-                    "Role %s does not exist in guild %s, skipping.",
-                    role_id,
-                    guild,
-                )
-                continue
+        # both settings are cached after the first check, so these do not await.
+        if (channel_id := self.channel.peek(guild)) is MISSING:
+            channel_id = await self.channel.get(guild)
+        channel = guild.get_channel(channel_id)
+        if channel is None:
+            log.warning(
+                "Channel %s does not exist in guild %s, skipping.",
+                channel_id,
+                guild,
+            )
+            return
 
-            for member_id, meatball_day in members.items():
-                member = guild.get_member(member_id)
-                if member is None:
-                    log.warning(
-                        "Member %s no longer exists in guild %s, removing from config.",
-                        member,
-                        guild,
-                    )
-                    await self.config.member_from_ids(guild_id, member_id).clear()
-                    continue
+        if not isinstance(channel, discord.TextChannel):
+            log.warning(
+                "Channel %s in guild %s is not a text channel, skipping.",
+                channel,
+                guild,
+            )
+            return
 
-                today = pendulum.today()
-                is_meatball_day = (
-                    today.month == meatball_day["month"]
-                    and today.day == meatball_day["day"]
-                )
+        if (role_id := self.role.peek(guild)) is MISSING:
+            role_id = await self.role.get(guild)
+        role = guild.get_role(role_id)
+        if role is None:
+            log.warning(
+                "Role %s does not exist in guild %s, skipping.",
+                role_id,
+                guild,
+            )
+            return
 
-                if is_meatball_day and role not in member.roles:
-                    await member.add_roles(role)
-                    log.info(
-                        "Added Meatball Day role to %s in guild %s",
-                        member,
-                        guild,
-                    )
+        members = {
+            member
+            for member_id in celebrants
+            if (member := guild.get_member(member_id)) is not None
+        }
+
+        holders = set(role.members)
+        for member in members - holders:
+            await member.add_roles(role)
+            progress.added += 1
+            log.info(
+                "Added Meatball Day role to %s in guild %s",
+                member,
+                guild,
+            )
 
-                    await channel.send(
-                        f"It's {member.mention}'s Meatball Day! :partying_face::tada:",
-                    )
-                elif not is_meatball_day and role in member.roles:
-                    await member.remove_roles(role)
-                    log.info(
-                        "Removed Meatball Day role from %s in guild %s",
-                        member,
-                        guild,
-                    )
+            await channel.send(
+                f"It's {member.mention}'s Meatball Day! :partying_face::tada:",
+            )
+
+        for member in holders - members:
+            await member.remove_roles(role)
+            progress.removed += 1
+            log.info(
+                "Removed Meatball Day role from %s in guild %s",
+                member,
+                guild,
+            )
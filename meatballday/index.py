@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import bisect
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+MonthDay = tuple[int, int]
+
+
+class CalendarIndex:
+    """Every registered Meatball Day, looked up by the date it falls on.
+
+    This mirrors the member config so that the daily check only has to read
+    the members celebrating on a given day, rather than every member. Each
+    guild's dates are also kept sorted through the year, built on first use
+    and dropped whenever one of them changes, for finding the next ones.
+    """
+
+    def __init__(self) -> None:
+        self.days: defaultdict[MonthDay, dict[int, set[int]]] = defaultdict(dict)
+        self.guilds: dict[int, dict[int, MonthDay]] = {}
+        self._sorted: dict[int, list[tuple[int, int, int]]] = {}
+
+    @classmethod
+    def from_config(cls, all_members: dict[int, dict[int, dict]]) -> CalendarIndex:
+        index = cls()
+        for guild_id, members in all_members.items():
+            for member_id, data in members.items():
+                if data.get("month") is not None and data.get("day") is not None:
+                    index.set(guild_id, member_id, data["month"], data["day"])
+        return index
+
+    def set(self, guild_id: int, member_id: int, month: int, day: int) -> None:
+        self.remove(guild_id, member_id)
+        self.guilds.setdefault(guild_id, {})[member_id] = (month, day)
+        self.days[(month, day)].setdefault(guild_id, set()).add(member_id)
+        self._sorted.pop(guild_id, None)
+
+    def remove(self, guild_id: int, member_id: int) -> None:
+        members = self.guilds.get(guild_id, {})
+        if (date := members.pop(member_id, None)) is None:
+            return
+        if not members:
+            del self.guilds[guild_id]
+        self._sorted.pop(guild_id, None)
+
+        guilds = self.days[date]
+        guilds[guild_id].discard(member_id)
+        if not guilds[guild_id]:
+            del guilds[guild_id]
+        if not guilds:
+            del self.days[date]
+
+    def remove_guild(self, guild_id: int) -> None:
+        for member_id in list(self.guilds.get(guild_id, {})):
+            self.remove(guild_id, member_id)
+
+    def on(self, guild_id: int, month: int, day: int) -> set[int]:
+        """Return the members of a guild whose Meatball Day is on the given date."""
+        return self.days.get((month, day), {}).get(guild_id, set())
+
+    def get(self, guild_id: int, member_id: int) -> MonthDay | None:
+        return self.guilds.get(guild_id, {}).get(member_id)
+
+    def members(self, guild_id: int) -> dict[int, MonthDay]:
+        return self.guilds.get(guild_id, {})
+
+    def after(
+        self,
+        guild_id: int,
+        month: int,
+        day: int,
+    ) -> Iterator[tuple[int, int, int]]:
+        """Yield `(month, day, member_id)` for a guild, starting after the date.
+
+        Dates run through to the end of the year and then wrap around, ending
+        with the given date itself, so every member is yielded once.
+        """
+        if (dates := self._sorted.get(guild_id)) is None:
+            dates = sorted(
+                (month, day, member_id)
+                for member_id, (month, day) in self.members(guild_id).items()
+            )
+            self._sorted[guild_id] = dates
+
+        start = bisect.bisect_right(dates, (month, day, float("inf")))
+        for index in range(start, start + len(dates)):
+            yield dates[index % len(dates)]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CheckProgress:
+    """How far a Meatball Day check has got through its guilds."""
+
+    guilds: int = 0
+    checked: int = 0
+    failed: int = 0
+    added: int = 0
+    removed: int = 0
+    slowest_guild: int | None = None
+    slowest_time: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+    done: bool = False
+
+    def guild_finished(self, guild_id: int, elapsed: float, *, failed: bool) -> None:
+        self.checked += 1
+        self.failed += failed
+        if elapsed > self.slowest_time:
+            self.slowest_guild = guild_id
+            self.slowest_time = elapsed
+
+    def finish(self) -> None:
+        self.elapsed = time.perf_counter() - self.started
+        self.done = True
+
+    def describe(self) -> str:
+        state = "Finished checking" if self.done else "Checking"
+        elapsed = self.elapsed if self.done else time.perf_counter() - self.started
+        text = (
+            f"{state} {self.checked}/{self.guilds} guilds in {elapsed:.1f}s"
+            f" ({self.failed} failed): "
+            f"added {self.added} and removed {self.removed} Meatball Day roles."
+        )
+        if self.slowest_guild is not None:
+            text += (
+                f" Slowest guild {self.slowest_guild}"
+                f" took {self.slowest_time:.1f}s."
+            )
+        return text
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import heapq
+from dataclasses import dataclass
+
+import pendulum
+
+DEFAULT_CHECK_TIME = "09:00"
+
+
+@functools.cache
+def load_timezone(name: str | None) -> pendulum.Timezone | pendulum.FixedTimezone:
+    """Load the named timezone, or the bot's local one. Each is only read once."""
+    if name is None:
+        return pendulum.local_timezone()
+    return pendulum.timezone(name)
+
+
+@dataclass
+class GuildSchedule:
+    """When a guild's daily check runs, from its config."""
+
+    timezone: str | None = None
+    check_time: str = DEFAULT_CHECK_TIME
+    # the guild's local date of its last check, as an ISO date
+    last_check: str | None = None
+
+    def tz(self) -> pendulum.Timezone | pendulum.FixedTimezone:
+        return load_timezone(self.timezone)
+
+    def today(self, now: pendulum.DateTime) -> pendulum.Date:
+        """Return the guild's local date at `now`."""
+        return now.in_timezone(self.tz()).date()
+
+    def next_check(self, now: pendulum.DateTime) -> pendulum.DateTime:
+        """When the next check is due.
+
+        If the guild has not been checked yet today, that is today's check
+        time, which may already have passed after downtime. Otherwise it is
+        tomorrow's check time.
+        """
+        local = now.in_timezone(self.tz())
+        hour, minute = (int(part) for part in self.check_time.split(":"))
+        today = local.date().isoformat()
+        if self.last_check is not None and self.last_check >= today:
+            local = local.add(days=1)
+        return local.at(hour, minute)
+
+
+class CheckScheduler:
+    """Guilds ordered by when their next daily check is due.
+
+    This is a heap of `(timestamp, guild_id)`. Rescheduling a guild pushes a
+    new entry and leaves the old one in place, to be skipped when it reaches
+    the top. `changed` is set whenever a guild is scheduled, so a sleeping
+    check loop can wake up if the new time is earlier.
+    """
+
+    def __init__(self) -> None:
+        self.guilds: dict[int, GuildSchedule] = {}
+        self.due: dict[int, float] = {}
+        self.heap: list[tuple[float, int]] = []
+        self.changed = asyncio.Event()
+
+    def schedule(
+        self,
+        guild_id: int,
+        schedule: GuildSchedule,
+        now: pendulum.DateTime,
+    ) -> pendulum.DateTime:
+        self.guilds[guild_id] = schedule
+        when = schedule.next_check(now)
+        self.due[guild_id] = when.timestamp()
+        heapq.heappush(self.heap, (when.timestamp(), guild_id))
+        self.changed.set()
+        return when
+
+    def checked(self, guild_id: int, now: pendulum.DateTime) -> str | None:
+        """Record a guild's check at `now` and schedule the next.
+
+        Returns the local date to save as its last check, or None if the
+        guild is no longer scheduled.
+        """
+        if (schedule := self.guilds.get(guild_id)) is None:
+            return None
+        schedule.last_check = schedule.today(now).isoformat()
+        self.schedule(guild_id, schedule, now)
+        return schedule.last_check
+
+    def remove(self, guild_id: int) -> None:
+        self.guilds.pop(guild_id, None)
+        self.due.pop(guild_id, None)
+
+    def next_due(self) -> float | None:
+        """Return when the earliest check is due, or None if nothing is scheduled."""
+        self._drop_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now: pendulum.DateTime) -> list[int]:
+        """Take every guild whose check is due at `now`."""
+        due: list[int] = []
+        timestamp = now.timestamp()
+        while True:
+            self._drop_stale()
+            if not self.heap or self.heap[0][0] > timestamp:
+                break
+            _, guild_id = heapq.heappop(self.heap)
+            del self.due[guild_id]
+            due.append(guild_id)
+        return due
+
+    def _drop_stale(self) -> None:
+        while self.heap and self.due.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
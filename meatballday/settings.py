@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import enum
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar
+
+if TYPE_CHECKING:
+    import discord
+    from redbot.core import Config
+    from redbot.core.config import Value
+
+T = TypeVar("T")
+
+
+class _Missing(enum.Enum):
+    MISSING = enum.auto()
+
+
+# returned by `GuildSetting.peek` for a guild that has not been read yet
+MISSING: Literal[_Missing.MISSING] = _Missing.MISSING
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    # each miss is one read from Config
+    misses: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def describe(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.1%} hit rate), "
+            f"{self.invalidations} invalidations"
+        )
+
+
+def _guild_id(guild: discord.abc.Snowflake | int) -> int:
+    return guild if isinstance(guild, int) else guild.id
+
+
+class GuildSetting(Generic[T]):
+    """One registered guild setting, read through an in-memory cache.
+
+    The first read for a guild goes to Config, and later reads are served
+    from memory. Writes made through `set` and `clear` update the cache, so
+    as long as every write goes through here the cache is never stale.
+    `peek` reads the cache without awaiting, for hot paths that can fall
+    back to `get` on a miss.
+    """
+
+    def __init__(self, config: Config, name: str, stats: CacheStats) -> None:
+        self.config = config
+        self.name = name
+        self.stats = stats
+        self.values: dict[int, T] = {}
+        # bumped on every invalidation, so a read that was in flight at the
+        # time does not put an old value back into the cache.
+        self.generation = 0
+
+    def peek(
+        self,
+        guild: discord.abc.Snowflake | int,
+    ) -> T | Literal[_Missing.MISSING]:
+        """Return the cached value, or MISSING. Misses are counted by `get`."""
+        value = self.values.get(_guild_id(guild), MISSING)
+        if value is not MISSING:
+            self.stats.hits += 1
+        return value
+
+    async def get(self, guild: discord.abc.Snowflake | int) -> T:
+        if (value := self.peek(guild)) is not MISSING:
+            return value
+
+        self.stats.misses += 1
+        guild_id = _guild_id(guild)
+        generation = self.generation
+        value = await self._value(guild_id)()
+        if generation == self.generation:
+            self.values[guild_id] = value
+        return value
+
+    async def set(self, guild: discord.abc.Snowflake | int, value: T) -> None:
+        guild_id = _guild_id(guild)
+        self.invalidate(guild_id)
+        await self._value(guild_id).set(value)
+        self.values[guild_id] = value
+
+    async def clear(self, guild: discord.abc.Snowflake | int) -> None:
+        """Reset the setting to its default."""
+        guild_id = _guild_id(guild)
+        self.invalidate(guild_id)
+        await self._value(guild_id).clear()
+
+    def invalidate(self, guild_id: int | None = None) -> None:
+        """Forget one guild's value, or every guild's with no `guild_id`."""
+        self.generation += 1
+        self.stats.invalidations += 1
+        if guild_id is None:
+            self.values.clear()
+        else:
+            self.values.pop(guild_id, None)
+
+    def _value(self, guild_id: int) -> Value:
+        return getattr(self.config.guild_from_id(guild_id), self.name)
+
+
+class GuildSettings:
+    """The cached guild settings of one cog, sharing a set of counters.
+
+    Declare each setting once after registering it with Config:
+
+        self.settings = GuildSettings(self.config)
+        self.channel_id: GuildSetting[int | None] = self.settings.add("channel_id")
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.stats = CacheStats()
+        self.settings: dict[str, GuildSetting[Any]] = {}
+
+    def add(self, name: str) -> GuildSetting[Any]:
+        setting: GuildSetting[Any] = GuildSetting(self.config, name, self.stats)
+        self.settings[name] = setting
+        return setting
+
+    def invalidate(self, guild_id: int | None = None) -> None:
+        """Forget cached values after a write that bypassed the settings."""
+        for setting in self.settings.values():
+            setting.invalidate(guild_id)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from enum import StrEnum
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+FIELDS = ["member_id", "month", "day"]
+
+
+class DateFormat(StrEnum):
+    CSV = "csv"
+    JSON = "json"
+
+    @classmethod
+    def from_filename(cls, filename: str) -> DateFormat:
+        """JSON for `.json` and `.jsonl` files, CSV for anything else."""
+        if filename.lower().endswith((".json", ".jsonl")):
+            return cls.JSON
+        return cls.CSV
+
+
+def read_rows(file: IO[bytes], fmt: DateFormat) -> Iterator[tuple[int, Any]]:
+    """Yield `(line_number, row)` for each row of an import, one at a time.
+
+    CSV files need a header naming the FIELDS columns. JSON files hold one
+    object per line, as written by `write_rows`. A line that is not valid
+    JSON is yielded as None, so it can be reported with the other rejects.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if fmt == DateFormat.CSV:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def write_rows(
+    file: IO[bytes],
+    fmt: DateFormat,
+    rows: Iterable[tuple[int, int, int]],
+) -> int:
+    """Write `(member_id, month, day)` rows, returning how many were written."""
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="", write_through=True)
+    count = 0
+    if fmt == DateFormat.CSV:
+        writer = csv.writer(text)
+        writer.writerow(FIELDS)
+        for count, row in enumerate(rows, 1):  # noqa: B007
+            writer.writerow(row)
+    else:
+        for count, row in enumerate(rows, 1):  # noqa: B007
+            text.write(json.dumps(dict(zip(FIELDS, row, strict=True))) + "\n")
+
+    # leave the file open for the caller.
+    text.detach()
+    return count
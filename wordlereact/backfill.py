@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from wordlereact.matcher import Matcher
+    from wordlereact.stats import Result, ScoreParser
+
+PAGE_SIZE = 100
+WORKERS = 2
+
+
+@dataclass(frozen=True)
+class Post:
+    """The parts of a message the matcher needs, safe to hand to a thread."""
+
+    guild_id: int
+    user_id: int
+    timestamp: int
+    content: str
+
+
+@dataclass
+class BackfillProgress:
+    scanned: int = 0
+    matched: int = 0
+    reactions: int = 0
+    results: int = 0
+    done: bool = False
+    # why the backfill stopped early, if it did
+    error: str | None = None
+
+    def describe(self, channel: str, *, dry_run: bool) -> str:
+        verb = "Would add" if dry_run else "Added"
+        state = "Finished" if self.done else "Backfilling"
+        if self.error is not None:
+            state = "Stopped backfilling"
+        description = (
+            f"{state} {channel}{' (dry run)' if dry_run else ''}: "
+            f"scanned {self.scanned} messages, {self.matched} matched.\n"
+            f"{verb} {self.reactions} reactions and {self.results} results."
+        )
+        if self.error is not None:
+            description += f"\n{self.error} Run it again to resume."
+        return description
+
+
+def match_page(
+    matcher: Matcher[str],
+    parser: ScoreParser,
+    posts: list[Post],
+) -> list[tuple[list[str], list[Result]]]:
+    """Match a page of posts. Runs in a worker thread during backfills."""
+    matches = []
+    for post in posts:
+        emojis = matcher.match(post.content)
+        results = (
+            parser.parse(
+                post.content,
+                guild_id=post.guild_id,
+                user_id=post.user_id,
+                timestamp=post.timestamp,
+            )
+            if emojis
+            else []
+        )
+        matches.append((emojis, results))
+    return matches
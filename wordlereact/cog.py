@@ -1,85 +1,523 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
 import discord
-from redbot.core import commands
+from redbot.core import Config, app_commands, commands
+from redbot.core.data_manager import cog_data_path
+from redbot.core.utils.chat_formatting import pagify
 
+from wordlereact.backfill import (
+    PAGE_SIZE,
+    WORKERS,
+    BackfillProgress,
+    Post,
+    match_page,
+)
+from wordlereact.dispatch import ReactionCache, ReactionDispatcher
+from wordlereact.registry import PatternRegistry
+from wordlereact.stats import GAMES, ResultStore, ScoreParser
 
-def re_compile(pattern: str) -> re.Pattern:
-    """Compile a regex pattern."""
-    return re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+if TYPE_CHECKING:
+    from wordlereact.matcher import Matcher
 
 
 reactions = [
-    (re_compile(r"wordle [\d,]+ [1-6]/6"), "🧠"),
-    (re_compile(r"wordle [\d,]+ 1/6"), "1️⃣"),
-    (re_compile(r"wordle [\d,]+ 2/6"), "2️⃣"),
-    (re_compile(r"wordle [\d,]+ X/6"), "🐌"),
-    (re_compile(r"daily duotrigordle #\d+\nguesses: \d+/37"), "🧠"),
-    (re_compile(r"daily duotrigordle #\d+\nguesses: X/37"), "🐌"),
-    (re_compile(r"scholardle \d+ [1-6]/6"), "🎓"),
-    (re_compile(r"scholardle \d+ 1/6"), "1️⃣"),
-    (re_compile(r"scholardle \d+ 2/6"), "2️⃣"),
-    (re_compile(r"scholardle \d+ X/6"), "🐌"),
-    (re_compile(r"worldle #\d+ \([\d\.]+\) [1-6]/6 \(100%\)"), "🗺️"),
-    (re_compile(r"worldle #\d+ \([\d\.]+\) X/6 \(\d+%\)"), "🐌"),
-    (re_compile(r"waffle\d+ [0-5]/5"), "🧇"),
-    (re_compile(r"waffle\d+ 5/5"), "⭐"),
-    (re_compile(r"waffle\d+ X/5"), "🐌"),
-    (re_compile(r"#wafflesilverteam"), "🥈"),
-    (re_compile(r"#wafflegoldteam"), "🥇"),
-    (re_compile(r"#wafflecenturion"), "🌟"),
-    (re_compile(r"#wafflemaster"), "🏆"),
-    (re_compile(r"flowdle \d+ \[\d+ moves\]"), "🚰"),
-    (re_compile(r"flowdle \d+ \[failed\]"), "🐌"),
-    (re_compile(r"jurassic wordle \(game #\d+\) - [1-8] / 8"), "🦕"),
-    (re_compile(r"jurassic wordle \(game #\d+\) - X / 8"), "🐌"),
-    (re_compile(r"jungdle \(game #\d+\) - [1-8] / 8"), "🦁"),
-    (re_compile(r"jungdle \(game #\d+\) - X / 8"), "🐌"),
-    (re_compile(r"dogsdle \(game #\d+\) - [1-8] / 8"), "🐶"),
-    (re_compile(r"dogsdle \(game #\d+\) - X / 8"), "🐌"),
-    (re_compile(r"framed #\d+.*\n+.*🎥 [🟥⬛ ]*🟩"), "🎬"),
-    (re_compile(r"framed #\d+.*\n+.*🎥 [🟥⬛ ]+$"), "🐌"),
-    (re_compile(r"moviedle #[\d-]+.*\n+.*🎥[🟥⬜⬛️ ]*🟩"), "🎬"),
-    (re_compile(r"moviedle #[\d-]+.*\n+.*🎥[🟥⬜⬛️ ]+$"), "🐌"),
-    (re_compile(r"posterdle #[\d-]+.*\n+ ⌛ .*\n 🍿.+🟩"), "📯"),
-    (re_compile(r"posterdle #[\d-]+.*\n+ ⌛ 0️⃣ .*\n 🍿.+🟩"), "0️⃣"),
-    (re_compile(r"posterdle #[\d-]+.*\n+ ⌛ .*\n 🍿 [⬜️🟥⬛️ ]+$"), "🐌"),
-    (re_compile(r"namethatride #[\d-]+.*\n+ ⌛ .*\n 🚗.+🟩"), "🚙"),
-    (re_compile(r"namethatride #[\d-]+.*\n+ ⌛ .*\n 🚗 [⬜️🟥⬛️ ]+$"), "🐌"),
-    (re_compile(r"heardle #\d+.*\n+.*🟩"), "👂"),
-    (re_compile(r"heardle #\d+.*\n+🔇"), "🐌"),
-    (re_compile(r"flaggle .*\n+.*\d+ pts"), "⛳"),
-    (re_compile(r"flaggle .*\n+.*gave up"), "🐌"),
-    (re_compile(r"#Polygonle \d+ [1-6]/6[^🟧]+?🟩"), "🔷"),
-    (re_compile(r"#Polygonle \d+ [1-6]/6[^🟩]+?🟧"), "🔶"),
-    (re_compile(r"#Polygonle \d+ X/6"), "🐌"),
-    (re_compile(r"#GuessTheGame #\d+.*\n+.*🎮[🟥⬛🟨 ]*🟩"), "🎮"),
-    (re_compile(r"#GuessTheGame #\d+.*\n+.*🎮 [🟥⬛🟨 ]+$"), "🐌"),
-    (re_compile(r"https://squaredle\.app/ \d+/\d+:"), "🟩"),
-    (re_compile(r"https://squaredle\.app/ .*[^📖]*📖"), "📖"),
-    (re_compile(r"https://squaredle\.app/ .*[^⏱️]*⏱️"), "⏱️"),
-    (re_compile(r"https://squaredle\.app/ .*[^🎯]*🎯"), "🎯"),
-    (re_compile(r"https://squaredle\.app/ .*[^🔥]*🔥"), "🔥"),
-    (re_compile(r"Episode #\d+\n+📺 .*🟩"), "📺"),
-    (re_compile(r"Episode #\d+\n+📺 [^🟩]+$"), "🐌"),
-    (re_compile(r"Birdle #\d+ \d/5"), "🐦"),
+    (r"wordle [\d,]+ [1-6]/6", "🧠"),
+    (r"wordle [\d,]+ 1/6", "1️⃣"),
+    (r"wordle [\d,]+ 2/6", "2️⃣"),
+    (r"wordle [\d,]+ X/6", "🐌"),
+    (r"daily duotrigordle #\d+\nguesses: \d+/37", "🧠"),
+    (r"daily duotrigordle #\d+\nguesses: X/37", "🐌"),
+    (r"scholardle \d+ [1-6]/6", "🎓"),
+    (r"scholardle \d+ 1/6", "1️⃣"),
+    (r"scholardle \d+ 2/6", "2️⃣"),
+    (r"scholardle \d+ X/6", "🐌"),
+    (r"worldle #\d+ \([\d\.]+\) [1-6]/6 \(100%\)", "🗺️"),
+    (r"worldle #\d+ \([\d\.]+\) X/6 \(\d+%\)", "🐌"),
+    (r"waffle\d+ [0-5]/5", "🧇"),
+    (r"waffle\d+ 5/5", "⭐"),
+    (r"waffle\d+ X/5", "🐌"),
+    (r"#wafflesilverteam", "🥈"),
+    (r"#wafflegoldteam", "🥇"),
+    (r"#wafflecenturion", "🌟"),
+    (r"#wafflemaster", "🏆"),
+    (r"flowdle \d+ \[\d+ moves\]", "🚰"),
+    (r"flowdle \d+ \[failed\]", "🐌"),
+    (r"jurassic wordle \(game #\d+\) - [1-8] / 8", "🦕"),
+    (r"jurassic wordle \(game #\d+\) - X / 8", "🐌"),
+    (r"jungdle \(game #\d+\) - [1-8] / 8", "🦁"),
+    (r"jungdle \(game #\d+\) - X / 8", "🐌"),
+    (r"dogsdle \(game #\d+\) - [1-8] / 8", "🐶"),
+    (r"dogsdle \(game #\d+\) - X / 8", "🐌"),
+    (r"framed #\d++.*+\n+.*🎥 [🟥⬛ ]*🟩", "🎬"),
+    (r"framed #\d++.*+\n+.*🎥 [🟥⬛ ]+$", "🐌"),
+    (r"moviedle #[\d-]++.*+\n+.*🎥[🟥⬜⬛️ ]*🟩", "🎬"),
+    (r"moviedle #[\d-]++.*+\n+.*🎥[🟥⬜⬛️ ]+$", "🐌"),
+    (r"posterdle #[\d-]++.*+\n+ ⌛ .*+\n 🍿.+🟩", "📯"),
+    (r"posterdle #[\d-]++.*+\n+ ⌛ 0️⃣ .*+\n 🍿.+🟩", "0️⃣"),
+    (r"posterdle #[\d-]++.*+\n+ ⌛ .*+\n 🍿 [⬜️🟥⬛️ ]+$", "🐌"),
+    (r"namethatride #[\d-]++.*+\n+ ⌛ .*+\n 🚗.+🟩", "🚙"),
+    (r"namethatride #[\d-]++.*+\n+ ⌛ .*+\n 🚗 [⬜️🟥⬛️ ]+$", "🐌"),
+    (r"heardle #\d++.*+\n+.*🟩", "👂"),
+    (r"heardle #\d++.*+\n+🔇", "🐌"),
+    (r"flaggle .*+\n+.*\d+ pts", "⛳"),
+    (r"flaggle .*+\n+.*gave up", "🐌"),
+    (r"#Polygonle \d+ [1-6]/6[^🟧]+?🟩", "🔷"),
+    (r"#Polygonle \d+ [1-6]/6[^🟩]+?🟧", "🔶"),
+    (r"#Polygonle \d+ X/6", "🐌"),
+    (r"#GuessTheGame #\d++.*+\n+.*🎮[🟥⬛🟨 ]*🟩", "🎮"),
+    (r"#GuessTheGame #\d++.*+\n+.*🎮 [🟥⬛🟨 ]+$", "🐌"),
+    (r"https://squaredle\.app/ \d+/\d+:", "🟩"),
+    (r"https://squaredle\.app/ [\s\S]*?📖", "📖"),
+    (r"https://squaredle\.app/ [\s\S]*?⏱️", "⏱️"),
+    (r"https://squaredle\.app/ [\s\S]*?🎯", "🎯"),
+    (r"https://squaredle\.app/ [\s\S]*?🔥", "🔥"),
+    (r"Episode #\d+\n+📺 .*🟩", "📺"),
+    (r"Episode #\d+\n+📺 [^🟩]+$", "🐌"),
+    (r"Birdle #\d+ \d/5", "🐦"),
 ]
 
 
+LEADERBOARD_SIZE = 10
+
+log = logging.getLogger("red.casper_cogs.wordle_react")
+
+
 class NotInGuildError(Exception):
     def __init__(self) -> None:
         super().__init__("Interaction is not in a guild, consider @guild_only")
 
 
+def ensure_guild(interaction: discord.Interaction) -> discord.Guild:
+    if interaction.guild is None:
+        raise NotInGuildError
+    return interaction.guild
+
+
 class WordleReact(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
 
+        self.config = Config.get_conf(
+            self,
+            identifier=50913460293717405164,
+            force_registration=True,
+        )
+
+        self.config.register_guild(
+            patterns=None,
+            backfill={},
+        )
+
+        self.registry = PatternRegistry(self.config, reactions)
+        self.dispatcher = ReactionDispatcher()
+        self.reacted = ReactionCache()
+        self.parser = ScoreParser()
+        self.results = ResultStore(cog_data_path(self) / "results.csv")
+        self.executor = ThreadPoolExecutor(
+            max_workers=WORKERS,
+            thread_name_prefix="wordlereact-backfill",
+        )
+        self.backfills: dict[int, asyncio.Task] = {}
+
+    async def cog_load(self) -> None:
+        await asyncio.to_thread(self.results.open)
+
+    async def cog_unload(self) -> None:
+        for task in self.backfills.values():
+            task.cancel()
+        await asyncio.gather(*self.backfills.values(), return_exceptions=True)
+        self.executor.shutdown(cancel_futures=True)
+
+        await self.dispatcher.close()
+        self.results.close()
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         if message.author.bot:
             return
 
-        for pattern, emoji in reactions:
-            if pattern.search(message.content):
-                await message.add_reaction(emoji)
+        matcher = await self.registry.matcher(message.guild)
+        emojis = matcher.match(message.content)
+        if not emojis:
+            return
+
+        self._record_results(message)
+
+        self.reacted.set(message.id, emojis)
+        await self.dispatcher.submit(message, emojis)
+
+    @commands.Cog.listener()
+    async def on_message_edit(
+        self,
+        before: discord.Message,
+        after: discord.Message,
+    ) -> None:
+        if after.author.bot or before.content == after.content:
+            return
+
+        matcher = await self.registry.matcher(after.guild)
+        emojis = matcher.match(after.content)
+
+        reacted = self.reacted.get(after.id)
+        if reacted is None:
+            reacted = frozenset(
+                str(reaction.emoji) for reaction in after.reactions if reaction.me
+            )
+        if not emojis and not reacted:
+            return
+
+        self._record_results(after)
+        self.reacted.set(after.id, emojis)
+
+        stale = reacted.difference(emojis)
+        if stale and self.bot.user is not None:
+            await self.dispatcher.submit_removal(after, stale, self.bot.user)
+        await self.dispatcher.submit(
+            after,
+            [emoji for emoji in emojis if emoji not in reacted],
+        )
+
+    def _record_results(self, message: discord.Message) -> None:
+        if message.guild is None:
+            return
+
+        for result in self.parser.parse(
+            message.content,
+            guild_id=message.guild.id,
+            user_id=message.author.id,
+            timestamp=int(message.created_at.timestamp()),
+        ):
+            self.results.record(result)
+
+    @app_commands.command(name="wordlereact-stats")
+    @app_commands.default_permissions(administrator=True)
+    async def stats(self, interaction: discord.Interaction) -> None:
+        stats = self.dispatcher.stats
+        matcher = await self.registry.matcher(interaction.guild)
+        await interaction.response.send_message(
+            f"Queued reactions: {stats.depth} (peak {stats.peak_depth})\n"
+            f"Sent: {stats.sent}, failed: {stats.failed}\n"
+            f"Latency: {stats.mean_latency:.2f}s mean, {stats.max_latency:.2f}s max\n"
+            f"Slow pattern runs: {matcher.overruns.total()}",
+            ephemeral=True,
+        )
+
+    @app_commands.command(name="wordlereact-list")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def list_patterns(self, interaction: discord.Interaction) -> None:
+        patterns = await self.registry.patterns(ensure_guild(interaction))
+        lines = "\n".join(
+            f"{index}. {emoji} `{pattern}`"
+            for index, (pattern, emoji) in enumerate(patterns, start=1)
+        )
+        pages = list(pagify(lines or "There are no patterns."))
+        await interaction.response.send_message(pages[0], ephemeral=True)
+        for page in pages[1:]:
+            await interaction.followup.send(page, ephemeral=True)
+
+    @app_commands.command(name="wordlereact-add")
+    @app_commands.describe(
+        pattern="The regular expression to look for",
+        emoji="The emoji to react with",
+    )
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def add_pattern(
+        self,
+        interaction: discord.Interaction,
+        pattern: str,
+        emoji: str,
+    ) -> None:
+        guild = ensure_guild(interaction)
+
+        try:
+            re.compile(pattern)
+        except re.error as ex:
+            await interaction.response.send_message(
+                f"That is not a valid pattern: {ex}.",
+                ephemeral=True,
+            )
+            return
+
+        patterns = await self.registry.patterns(guild)
+        await self.registry.set_patterns(guild, [*patterns, (pattern, emoji)])
+        await interaction.response.send_message(
+            f"I will now react with {emoji} to `{pattern}`.",
+        )
+
+    @app_commands.command(name="wordlereact-remove")
+    @app_commands.describe(index="The number of the pattern in /wordlereact-list")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def remove_pattern(
+        self,
+        interaction: discord.Interaction,
+        index: int,
+    ) -> None:
+        guild = ensure_guild(interaction)
+
+        patterns = list(await self.registry.patterns(guild))
+        if not 1 <= index <= len(patterns):
+            await interaction.response.send_message(
+                f"Index must be between 1 and {len(patterns)}.",
+                ephemeral=True,
+            )
+            return
+
+        pattern, emoji = patterns.pop(index - 1)
+        await self.registry.set_patterns(guild, patterns)
+        await interaction.response.send_message(
+            f"I will no longer react with {emoji} to `{pattern}`.",
+        )
+
+    @app_commands.command(name="wordlereact-reset")
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def reset_patterns(self, interaction: discord.Interaction) -> None:
+        await self.registry.set_patterns(ensure_guild(interaction), None)
+        await interaction.response.send_message(
+            "I have restored the default patterns.",
+        )
+
+    @app_commands.command(name="wordle-stats")
+    @app_commands.describe(
+        game="The game to show stats for",
+        member="Whose stats to show, defaults to you",
+    )
+    @app_commands.choices(
+        game=[app_commands.Choice(name=name, value=name) for name in GAMES],
+    )
+    @app_commands.guild_only()
+    async def wordle_stats(
+        self,
+        interaction: discord.Interaction,
+        game: str,
+        member: discord.Member | None = None,
+    ) -> None:
+        guild = ensure_guild(interaction)
+        user = member or interaction.user
+
+        stats = self.results.player(guild.id, game, user.id)
+        if stats is None:
+            await interaction.response.send_message(
+                f"{user.mention} has not played {game} here yet.",
+                ephemeral=True,
+                allowed_mentions=discord.AllowedMentions.none(),
+            )
+            return
+
+        distribution = "\n".join(
+            f"{'X' if score is None else score}: {count}"
+            for score, count in sorted(
+                stats.distribution.items(),
+                key=lambda pair: (pair[0] is None, pair[0] or 0),
+            )
+        )
+        average = "-" if stats.average is None else f"{stats.average:.2f}"
+        await interaction.response.send_message(
+            f"**{game}** stats for {user.mention}\n"
+            f"Played: {stats.played}, won: {stats.wins} "
+            f"({stats.wins / stats.played:.0%})\n"
+            f"Average score: {average}\n"
+            f"Streak: {stats.streak} (best {stats.max_streak})\n"
+            f"{distribution}",
+            ephemeral=True,
+            allowed_mentions=discord.AllowedMentions.none(),
+        )
+
+    @app_commands.command(name="wordle-leaderboard")
+    @app_commands.describe(game="The game to show the leaderboard for")
+    @app_commands.choices(
+        game=[app_commands.Choice(name=name, value=name) for name in GAMES],
+    )
+    @app_commands.guild_only()
+    async def wordle_leaderboard(
+        self,
+        interaction: discord.Interaction,
+        game: str,
+    ) -> None:
+        guild = ensure_guild(interaction)
+
+        board = self.results.leaderboard(guild.id, game)[:LEADERBOARD_SIZE]
+        if not board:
+            await interaction.response.send_message(
+                f"Nobody has played {game} here yet.",
+                ephemeral=True,
+            )
+            return
+
+        lines = "\n".join(
+            f"{rank}. <@{user_id}> - {stats.wins} wins, "
+            f"average {'-' if stats.average is None else f'{stats.average:.2f}'}, "
+            f"streak {stats.streak}"
+            for rank, (user_id, stats) in enumerate(board, start=1)
+        )
+        await interaction.response.send_message(
+            f"**{game}** leaderboard\n{lines}",
+            allowed_mentions=discord.AllowedMentions.none(),
+        )
+
+    @app_commands.command(name="wordlereact-backfill")
+    @app_commands.describe(
+        channel="The channel to go through",
+        dry_run="Only count what would be done, without reacting or recording",
+    )
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def backfill(
+        self,
+        interaction: discord.Interaction,
+        channel: discord.TextChannel,
+        dry_run: bool = False,  # noqa: FBT001, FBT002
+    ) -> None:
+        if channel.id in self.backfills:
+            await interaction.response.send_message(
+                f"{channel.mention} is already being backfilled.",
+                ephemeral=True,
+            )
+            return
+
+        progress = BackfillProgress()
+        await interaction.response.send_message(
+            progress.describe(channel.mention, dry_run=dry_run),
+            ephemeral=True,
+        )
+
+        task = asyncio.create_task(
+            self._backfill(interaction, channel, progress, dry_run=dry_run),
+        )
+        self.backfills[channel.id] = task
+        task.add_done_callback(lambda _: self.backfills.pop(channel.id, None))
+
+    async def _backfill(
+        self,
+        interaction: discord.Interaction,
+        channel: discord.TextChannel,
+        progress: BackfillProgress,
+        *,
+        dry_run: bool,
+    ) -> None:
+        """Backfill `channel`, reporting the outcome in the original response."""
+        try:
+            await self._backfill_channel(
+                interaction,
+                channel,
+                progress,
+                dry_run=dry_run,
+            )
+        except discord.Forbidden:
+            log.warning("Cannot read the history of %s in %s", channel, channel.guild)
+            progress.error = "I need permission to read its message history."
+        except Exception:
+            log.exception("Failed to backfill %s in guild %s", channel, channel.guild)
+            progress.error = "Something went wrong, check the bot's logs."
+        else:
+            log.info("Backfilled %s in guild %s: %s", channel, channel.guild, progress)
+
+        progress.done = True
+        with contextlib.suppress(discord.HTTPException):
+            await interaction.edit_original_response(
+                content=progress.describe(channel.mention, dry_run=dry_run),
+            )
+
+    async def _backfill_channel(
+        self,
+        interaction: discord.Interaction,
+        channel: discord.TextChannel,
+        progress: BackfillProgress,
+        *,
+        dry_run: bool,
+    ) -> None:
+        """Run the messages in `channel` since the last checkpoint through the matcher.
+
+        Messages are fetched and matched a page at a time, with matching done in
+        the worker pool. The checkpoint is saved after each page so that an
+        interrupted backfill resumes where it stopped.
+        """
+        checkpoints = self.config.guild(channel.guild).backfill
+        checkpoint = await checkpoints.get_raw(str(channel.id), default=None)
+        after = discord.Object(checkpoint) if checkpoint is not None else None
+        matcher = await self.registry.matcher(channel.guild)
+
+        page: list[discord.Message] = []
+        async for message in channel.history(
+            limit=None,
+            after=after,
+            oldest_first=True,
+        ):
+            page.append(message)
+            if len(page) < PAGE_SIZE:
+                continue
+
+            await self._backfill_page(matcher, page, progress, dry_run=dry_run)
+            if not dry_run:
+                await checkpoints.set_raw(str(channel.id), value=page[-1].id)
+            page = []
+
+            with contextlib.suppress(discord.HTTPException):
+                await interaction.edit_original_response(
+                    content=progress.describe(channel.mention, dry_run=dry_run),
+                )
+
+        if page:
+            await self._backfill_page(matcher, page, progress, dry_run=dry_run)
+            if not dry_run:
+                await checkpoints.set_raw(str(channel.id), value=page[-1].id)
+
+    async def _backfill_page(
+        self,
+        matcher: Matcher[str],
+        page: list[discord.Message],
+        progress: BackfillProgress,
+        *,
+        dry_run: bool,
+    ) -> None:
+        messages = [message for message in page if not message.author.bot]
+        posts = [
+            Post(
+                guild_id=message.guild.id if message.guild else 0,
+                user_id=message.author.id,
+                timestamp=int(message.created_at.timestamp()),
+                content=message.content,
+            )
+            for message in messages
+        ]
+
+        loop = asyncio.get_running_loop()
+        matches = await loop.run_in_executor(
+            self.executor,
+            match_page,
+            matcher,
+            self.parser,
+            posts,
+        )
+
+        progress.scanned += len(page)
+        for message, (emojis, results) in zip(messages, matches, strict=True):
+            if not emojis:
+                continue
+
+            progress.matched += 1
+            existing = {
+                str(reaction.emoji) for reaction in message.reactions if reaction.me
+            }
+            missing = [
+                emoji for emoji in dict.fromkeys(emojis) if emoji not in existing
+            ]
+            progress.reactions += len(missing)
+
+            if dry_run:
+                progress.results += len(results)
+                continue
+
+            progress.results += sum(self.results.record(result) for result in results)
+            if missing:
+                await self.dispatcher.submit(message, missing)
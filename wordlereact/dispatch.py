@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import discord
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+log = logging.getLogger("red.casper_cogs.wordle_react")
+
+SLOW_REACTION = 2.0
+CACHE_SIZE = 1000
+
+
+@dataclass
+class DispatchStats:
+    depth: int = 0
+    peak_depth: int = 0
+    sent: int = 0
+    failed: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        handled = self.sent + self.failed
+        return self.total_latency / handled if handled else 0.0
+
+
+@dataclass
+class Reaction:
+    message: discord.Message
+    emoji: str
+    queued_at: float
+    # set when the reaction should be removed from this member instead of added.
+    member: discord.abc.Snowflake | None = None
+
+
+class ReactionCache:
+    """Remembers which emoji were added to the most recent messages."""
+
+    def __init__(self, maxsize: int = CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.entries: OrderedDict[int, frozenset[str]] = OrderedDict()
+
+    def get(self, message_id: int) -> frozenset[str] | None:
+        emojis = self.entries.get(message_id)
+        if emojis is not None:
+            self.entries.move_to_end(message_id)
+        return emojis
+
+    def set(self, message_id: int, emojis: Iterable[str]) -> None:
+        self.entries[message_id] = frozenset(emojis)
+        self.entries.move_to_end(message_id)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+class ReactionDispatcher:
+    """Adds and removes reactions through one queue per channel.
+
+    Discord rate limits reactions per channel, so each channel's queue is
+    drained in order by a single worker, while a shared semaphore bounds how
+    many requests are in flight across all channels. Workers exit once their
+    queue is empty, so idle channels cost nothing.
+    """
+
+    def __init__(self, *, concurrency: int = 4, maxsize: int = 100) -> None:
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.maxsize = maxsize
+        self.queues: dict[int, asyncio.Queue[Reaction]] = {}
+        self.workers: dict[int, asyncio.Task] = {}
+        self.stats = DispatchStats()
+
+    async def submit(self, message: discord.Message, emojis: Iterable[str]) -> None:
+        """Queue each distinct emoji in `emojis` as a reaction to `message`.
+
+        Waits if the channel's queue is full.
+        """
+        for emoji in dict.fromkeys(emojis):
+            await self._enqueue(Reaction(message, emoji, time.monotonic()))
+
+    async def submit_removal(
+        self,
+        message: discord.Message,
+        emojis: Iterable[str],
+        member: discord.abc.Snowflake,
+    ) -> None:
+        """Queue the removal of `member`'s reactions in `emojis` from `message`."""
+        for emoji in dict.fromkeys(emojis):
+            await self._enqueue(Reaction(message, emoji, time.monotonic(), member))
+
+    async def _enqueue(self, reaction: Reaction) -> None:
+        channel_id = reaction.message.channel.id
+        queue = self.queues.setdefault(channel_id, asyncio.Queue(self.maxsize))
+        await queue.put(reaction)
+
+        self.stats.depth += 1
+        self.stats.peak_depth = max(self.stats.peak_depth, self.stats.depth)
+
+        if channel_id not in self.workers:
+            self.workers[channel_id] = asyncio.create_task(
+                self._drain(channel_id, queue),
+            )
+
+    async def close(self) -> None:
+        for worker in self.workers.values():
+            worker.cancel()
+        await asyncio.gather(*self.workers.values(), return_exceptions=True)
+        self.workers.clear()
+        self.queues.clear()
+        self.stats.depth = 0
+
+    async def _drain(self, channel_id: int, queue: asyncio.Queue[Reaction]) -> None:
+        try:
+            while not queue.empty():
+                reaction = queue.get_nowait()
+                self.stats.depth -= 1
+                async with self.semaphore:
+                    await self._send(reaction)
+        finally:
+            self.workers.pop(channel_id, None)
+            self.queues.pop(channel_id, None)
+
+    async def _send(self, reaction: Reaction) -> None:
+        try:
+            if reaction.member is None:
+                await reaction.message.add_reaction(reaction.emoji)
+            else:
+                await reaction.message.remove_reaction(reaction.emoji, reaction.member)
+        except discord.HTTPException as ex:
+            self.stats.failed += 1
+            log.warning(
+                "Failed to %s %s on message %s: %s",
+                "add" if reaction.member is None else "remove",
+                reaction.emoji,
+                reaction.message.id,
+                ex,
+            )
+        else:
+            self.stats.sent += 1
+
+        latency = time.monotonic() - reaction.queued_at
+        self.stats.total_latency += latency
+        self.stats.max_latency = max(self.stats.max_latency, latency)
+        if latency > SLOW_REACTION:
+            log.info(
+                "Reaction to message %s took %.1fs, likely rate limited",
+                reaction.message.id,
+                latency,
+            )
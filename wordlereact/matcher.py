@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+log = logging.getLogger("red.casper_cogs.wordle_react")
+
+T = TypeVar("T")
+
+QUANTIFIERS = frozenset("*+?{")
+METACHARACTERS = frozenset(".^$*+?{}[]()|\\")
+
+
+def re_compile(pattern: str) -> re.Pattern:
+    """Compile a regex pattern."""
+    return re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+
+
+def literal_prefix(pattern: str) -> str:
+    """Return the literal text every match of `pattern` must start with.
+
+    An empty string means no such prefix could be determined, for example
+    because the pattern starts with a character class or contains a top-level
+    alternation.
+    """
+    if "|" in pattern.replace("\\|", ""):
+        return ""
+
+    prefix: list[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            escaped = pattern[i + 1 : i + 2]
+            if not escaped or escaped.isalnum():
+                break
+            char, size = escaped, 2
+        elif char in METACHARACTERS:
+            break
+        else:
+            size = 1
+
+        if pattern[i + size : i + size + 1] in QUANTIFIERS:
+            break
+
+        prefix.append(char)
+        i += size
+
+    return "".join(prefix).strip()
+
+
+class Matcher(Generic[T]):
+    """Runs a table of patterns against messages, gated on literal keywords.
+
+    Each pattern is filed under the literal text it must start with. A single
+    scan for any of those keywords decides which patterns are worth running,
+    so messages without a keyword are rejected without running any of them.
+
+    Python's regex engine cannot be interrupted, so instead of a hard timeout
+    the matcher can be guarded: content is cut to `max_length` characters
+    before any pattern sees it, and any pattern taking longer than `budget`
+    seconds is logged and counted in `overruns`.
+    """
+
+    def __init__(
+        self,
+        table: Iterable[tuple[re.Pattern, T]],
+        *,
+        max_length: int | None = None,
+        budget: float | None = None,
+    ) -> None:
+        self.max_length = max_length
+        self.budget = budget
+        self.overruns: Counter[str] = Counter()
+
+        self.gated: dict[str, list[tuple[int, re.Pattern, T]]] = {}
+        self.ungated: list[tuple[int, re.Pattern, T]] = []
+
+        for index, (pattern, value) in enumerate(table):
+            keyword = literal_prefix(pattern.pattern).lower()
+            if keyword:
+                self.gated.setdefault(keyword, []).append((index, pattern, value))
+            else:
+                self.ungated.append((index, pattern, value))
+
+        # a longer keyword can hide a shorter one it contains, e.g.
+        # "jurassic wordle" and "wordle", so each keyword implies its parts.
+        self.implied = {
+            keyword: [other for other in self.gated if other in keyword]
+            for keyword in self.gated
+        }
+
+        keywords = sorted(self.gated, key=len, reverse=True)
+        self.gate = (
+            re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+            if keywords
+            else None
+        )
+
+    def keywords(self, content: str) -> set[str]:
+        """Find every keyword that appears in `content`."""
+        if self.gate is None:
+            return set()
+
+        # resume just past the start of each hit rather than its end, so that
+        # keywords overlapping the previous hit are not skipped over.
+        found: set[str] = set()
+        hit = self.gate.search(content)
+        while hit is not None:
+            keyword = hit.group().lower()
+            if keyword not in found:
+                found.update(self.implied.get(keyword, ()))
+                if len(found) == len(self.gated):
+                    break
+            hit = self.gate.search(content, hit.start() + 1)
+        return found
+
+    def candidates(self, content: str) -> list[tuple[int, re.Pattern, T]]:
+        """Return the patterns that could match `content`, in table order."""
+        keywords = self.keywords(content)
+        if not keywords and not self.ungated:
+            return []
+
+        entries = list(self.ungated)
+        for keyword in keywords:
+            entries.extend(self.gated[keyword])
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+    def search(self, content: str) -> Iterator[tuple[T, re.Match]]:
+        """Yield the value and match of every pattern found in `content`."""
+        if self.max_length is not None:
+            content = content[: self.max_length]
+
+        for _, pattern, value in self.candidates(content):
+            if self.budget is None:
+                found = pattern.search(content)
+            else:
+                start = time.perf_counter()
+                found = pattern.search(content)
+                elapsed = time.perf_counter() - start
+                if elapsed > self.budget:
+                    self.overruns[pattern.pattern] += 1
+                    log.warning(
+                        "Pattern %r took %.1fms on %d characters",
+                        pattern.pattern,
+                        elapsed * 1000,
+                        len(content),
+                    )
+
+            if found:
+                yield value, found
+
+    def match(self, content: str) -> list[T]:
+        """Return the value of every pattern found in `content`, in table order."""
+        return [value for value, _ in self.search(content)]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+import re
+import weakref
+from typing import TYPE_CHECKING
+
+from wordlereact.matcher import Matcher, re_compile
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import discord
+    from redbot.core import Config
+
+log = logging.getLogger("red.casper_cogs.wordle_react")
+
+PatternSet = tuple[tuple[str, str], ...]
+
+# real share strings are a few hundred characters long; anything past this is
+# not worth handing to the patterns.
+MAX_CONTENT_LENGTH = 2000
+PATTERN_BUDGET = 0.005
+
+
+class PatternRegistry:
+    """Caches a compiled matcher for each guild's pattern set.
+
+    Guilds without their own patterns use the default matcher, and guilds with
+    identical custom sets share one matcher, so memory follows the number of
+    distinct pattern sets rather than the number of guilds.
+    """
+
+    def __init__(self, config: Config, default: Sequence[tuple[str, str]]) -> None:
+        self.config = config
+        self.default_patterns: PatternSet = tuple(
+            (pattern, emoji) for pattern, emoji in default
+        )
+        self.default = self._build(self.default_patterns)
+        self.guilds: dict[int, Matcher[str]] = {}
+        self.shared: weakref.WeakValueDictionary[
+            PatternSet,
+            Matcher[str],
+        ] = weakref.WeakValueDictionary()
+
+    async def matcher(self, guild: discord.Guild | None) -> Matcher[str]:
+        if guild is None:
+            return self.default
+
+        if (matcher := self.guilds.get(guild.id)) is None:
+            patterns = await self.config.guild(guild).patterns()
+            matcher = self._lookup(patterns)
+            self.guilds[guild.id] = matcher
+        return matcher
+
+    async def patterns(self, guild: discord.Guild) -> PatternSet:
+        patterns = await self.config.guild(guild).patterns()
+        if patterns is None:
+            return self.default_patterns
+        return tuple((pattern, emoji) for pattern, emoji in patterns)
+
+    async def set_patterns(
+        self,
+        guild: discord.Guild,
+        patterns: Sequence[tuple[str, str]] | None,
+    ) -> None:
+        """Store `patterns` for `guild`, or restore the defaults if None."""
+        if patterns is not None:
+            patterns = [[pattern, emoji] for pattern, emoji in patterns]
+        await self.config.guild(guild).patterns.set(patterns)
+        self.guilds[guild.id] = self._lookup(patterns)
+
+    def _lookup(self, patterns: Sequence[Sequence[str]] | None) -> Matcher[str]:
+        if patterns is None:
+            return self.default
+
+        key: PatternSet = tuple((pattern, emoji) for pattern, emoji in patterns)
+        if key == self.default_patterns:
+            return self.default
+
+        if (matcher := self.shared.get(key)) is None:
+            matcher = self._build(key)
+            self.shared[key] = matcher
+        return matcher
+
+    @staticmethod
+    def _build(patterns: PatternSet) -> Matcher[str]:
+        table = []
+        for pattern, emoji in patterns:
+            try:
+                table.append((re_compile(pattern), emoji))
+            except re.error as ex:
+                log.warning("Skipping invalid pattern %r: %s", pattern, ex)
+        return Matcher(
+            table,
+            max_length=MAX_CONTENT_LENGTH,
+            budget=PATTERN_BUDGET,
+        )
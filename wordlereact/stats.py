@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import csv
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, TextIO
+
+from wordlereact.matcher import Matcher, re_compile
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+log = logging.getLogger("red.casper_cogs.wordle_react")
+
+
+@dataclass(frozen=True)
+class Game:
+    name: str
+    lower_is_better: bool = True
+
+
+WORDLE = Game("wordle")
+DUOTRIGORDLE = Game("duotrigordle")
+SCHOLARDLE = Game("scholardle")
+WORLDLE = Game("worldle")
+WAFFLE = Game("waffle", lower_is_better=False)
+FLOWDLE = Game("flowdle")
+JURASSIC_WORDLE = Game("jurassic wordle")
+JUNGDLE = Game("jungdle")
+DOGSDLE = Game("dogsdle")
+POLYGONLE = Game("polygonle")
+BIRDLE = Game("birdle")
+
+# each pattern captures the puzzle number and the score. a missing score or an
+# X means the puzzle was failed.
+scores = [
+    (r"wordle (?P<puzzle>[\d,]+) (?P<score>[1-6X])/6", WORDLE),
+    (
+        r"daily duotrigordle #(?P<puzzle>\d+)\nguesses: (?P<score>\d+|X)/37",
+        DUOTRIGORDLE,
+    ),
+    (r"scholardle (?P<puzzle>\d+) (?P<score>[1-6X])/6", SCHOLARDLE),
+    (r"worldle #(?P<puzzle>\d+) \([\d\.]+\) (?P<score>[1-6X])/6", WORLDLE),
+    (r"waffle(?P<puzzle>\d+) (?P<score>[0-5X])/5", WAFFLE),
+    (r"flowdle (?P<puzzle>\d+) \[(?:(?P<score>\d+) moves|failed)\]", FLOWDLE),
+    (
+        r"jurassic wordle \(game #(?P<puzzle>\d+)\) - (?P<score>[1-8X]) / 8",
+        JURASSIC_WORDLE,
+    ),
+    (r"jungdle \(game #(?P<puzzle>\d+)\) - (?P<score>[1-8X]) / 8", JUNGDLE),
+    (r"dogsdle \(game #(?P<puzzle>\d+)\) - (?P<score>[1-8X]) / 8", DOGSDLE),
+    (r"#Polygonle (?P<puzzle>\d+) (?P<score>[1-6X])/6", POLYGONLE),
+    (r"Birdle #(?P<puzzle>\d+) (?P<score>\d|X)/5", BIRDLE),
+]
+
+GAMES = {game.name: game for _, game in scores}
+
+
+@dataclass(frozen=True)
+class Result:
+    guild_id: int
+    user_id: int
+    game: str
+    puzzle: int
+    score: int | None
+    timestamp: int
+
+
+class ScoreParser:
+    def __init__(self) -> None:
+        self.matcher = Matcher(
+            [(re_compile(pattern), game) for pattern, game in scores],
+        )
+
+    def parse(
+        self,
+        content: str,
+        *,
+        guild_id: int,
+        user_id: int,
+        timestamp: int,
+    ) -> list[Result]:
+        results = []
+        for game, found in self.matcher.search(content):
+            score = found.group("score")
+            results.append(
+                Result(
+                    guild_id=guild_id,
+                    user_id=user_id,
+                    game=game.name,
+                    puzzle=int(found.group("puzzle").replace(",", "")),
+                    score=None if score in (None, "X", "x") else int(score),
+                    timestamp=timestamp,
+                ),
+            )
+        return results
+
+
+@dataclass
+class PlayerStats:
+    played: int = 0
+    wins: int = 0
+    total: int = 0
+    max_streak: int = 0
+    latest: int | None = None
+    distribution: Counter[int | None] = field(default_factory=Counter)
+    results: dict[int, int | None] = field(default_factory=dict)
+    # length of each winning run, kept up to date at both ends of the run.
+    runs: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def average(self) -> float | None:
+        return self.total / self.wins if self.wins else None
+
+    @property
+    def streak(self) -> int:
+        """Winning run ending at the most recent puzzle played."""
+        if self.latest is None or self.results[self.latest] is None:
+            return 0
+        return self.runs[self.latest]
+
+    def add(self, puzzle: int, score: int | None) -> bool:
+        """Add a result, returning False if this puzzle was already counted.
+
+        Results may arrive in any order, so streaks are tracked as runs of
+        consecutive winning puzzles which merge as the gaps are filled.
+        """
+        if puzzle in self.results:
+            return False
+
+        self.results[puzzle] = score
+        self.played += 1
+        self.distribution[score] += 1
+        if self.latest is None or puzzle > self.latest:
+            self.latest = puzzle
+
+        if score is not None:
+            self.wins += 1
+            self.total += score
+
+            before = self.runs.get(puzzle - 1, 0)
+            after = self.runs.get(puzzle + 1, 0)
+            length = before + 1 + after
+            self.runs[puzzle - before] = length
+            self.runs[puzzle + after] = length
+            self.runs[puzzle] = length
+            self.max_streak = max(self.max_streak, length)
+
+        return True
+
+
+class ResultStore:
+    """Append-only log of game results with running per-player aggregates.
+
+    The log is replayed once when opened. After that each result is appended
+    to the file and folded into the aggregates, so lookups never touch
+    history.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.file: TextIO | None = None
+        self.players: dict[tuple[int, str], dict[int, PlayerStats]] = {}
+        self.leaderboards: dict[tuple[int, str], list[tuple[int, PlayerStats]]] = {}
+
+    def open(self) -> None:
+        if self.path.exists():
+            with self.path.open(newline="") as file:
+                for row in csv.reader(file):
+                    try:
+                        self._fold(_from_row(row))
+                    except (ValueError, IndexError):
+                        log.warning("Skipping malformed result row %r", row)
+
+        self.file = self.path.open("a", newline="")
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def record(self, result: Result) -> bool:
+        """Store `result`, returning False if it was already known."""
+        if not self._fold(result):
+            return False
+
+        if self.file is not None:
+            csv.writer(self.file).writerow(_to_row(result))
+            self.file.flush()
+        return True
+
+    def player(self, guild_id: int, game: str, user_id: int) -> PlayerStats | None:
+        return self.players.get((guild_id, game), {}).get(user_id)
+
+    def leaderboard(self, guild_id: int, game: str) -> list[tuple[int, PlayerStats]]:
+        """Players of `game` in `guild_id`, most wins first, then best average."""
+        key = (guild_id, game)
+        if (board := self.leaderboards.get(key)) is None:
+            sign = 1 if GAMES[game].lower_is_better else -1
+            board = sorted(
+                self.players.get(key, {}).items(),
+                key=lambda pair: (-pair[1].wins, sign * (pair[1].average or 0)),
+            )
+            self.leaderboards[key] = board
+        return board
+
+    def _fold(self, result: Result) -> bool:
+        key = (result.guild_id, result.game)
+        players = self.players.setdefault(key, {})
+        stats = players.setdefault(result.user_id, PlayerStats())
+        if not stats.add(result.puzzle, result.score):
+            return False
+
+        self.leaderboards.pop(key, None)
+        return True
+
+
+def _to_row(result: Result) -> list[object]:
+    return [
+        result.guild_id,
+        result.user_id,
+        result.game,
+        result.puzzle,
+        "" if result.score is None else result.score,
+        result.timestamp,
+    ]
+
+
+def _from_row(row: list[str]) -> Result:
+    guild_id, user_id, game, puzzle, score, timestamp = row
+    return Result(
+        guild_id=int(guild_id),
+        user_id=int(user_id),
+        game=game,
+        puzzle=int(puzzle),
+        score=int(score) if score else None,
+        timestamp=int(timestamp),
+    )